@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+import sys
+import os
+import json
+import time
+import resource
+import numpy as np
+from yfinance_quotes import screen_universe
+
+# --- Fixture shape ---
+N_SYMBOLS = 3000
+N_DAYS = 260
+TOP = 25
+VALUE_RTOL = 1e-9            # chunked/pooled merges must reproduce the single-chunk values
+FIXTURE_DIR = os.path.join(os.getcwd(), "tmp", "screener_fixture")
+
+
+def build_fixture(path: str = FIXTURE_DIR, n_symbols: int = N_SYMBOLS, n_days: int = N_DAYS,
+                  seed: int = 7) -> list:
+    """Write a synthetic random-walk universe as memory-mappable .npy columns; returns the symbols."""
+    rng = np.random.default_rng(seed)
+    os.makedirs(path, exist_ok=True)
+    rets = rng.normal(0.0004, 0.02, size=(n_days, n_symbols))
+    close = 50.0 * np.exp(np.cumsum(rets, axis=0))
+    spread = np.abs(rng.normal(0.0, 0.01, size=close.shape))
+    high = close * (1.0 + spread)
+    low = close * (1.0 - spread)
+    volume = rng.lognormal(13.0, 0.5, size=close.shape)
+    volume[-1] *= rng.choice([1.0, 3.0], size=n_symbols, p=[0.95, 0.05])
+    close[rng.random(close.shape) < 0.001] = np.nan  # sprinkle missing bars
+    for name, arr in (("close", close), ("high", high), ("low", low), ("volume", volume)):
+        np.save(os.path.join(path, f"{name}.npy"), arr)
+    symbols = [f"SYM{i:04d}" for i in range(n_symbols)]
+    with open(os.path.join(path, "symbols.txt"), "w", encoding="utf-8") as f:
+        f.write("\n".join(symbols) + "\n")
+    return symbols
+
+
+def run(symbols: list, workers: int, chunk: int, repeat: int = 3) -> dict:
+    times = []
+    rows = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        rows = screen_universe(symbols, "changePercent", TOP, chunk, workers, True, FIXTURE_DIR)
+        times.append(time.perf_counter() - t0)
+    return {
+        "workers": workers,
+        "chunk": chunk,
+        "bestMs": round(min(times) * 1000, 1),
+        "medianMs": round(float(np.median(times)) * 1000, 1),
+        "top": [r["symbol"] for r in rows],
+        "values": [r["changePercent"] for r in rows],
+    }
+
+
+def consistent(results: list) -> bool:
+    """Every run returns the same ordered top-N symbols with matching values."""
+    ref = results[0]
+    return all(
+        r["top"] == ref["top"]
+        and np.allclose(r["values"], ref["values"], rtol=VALUE_RTOL, atol=0.0)
+        for r in results[1:]
+    ) and len(ref["top"]) > 0
+
+
+if __name__ == "__main__":
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    symbols = build_fixture()
+    results = [
+        run(symbols, 0, 3000),
+        run(symbols, 0, 200),
+        run(symbols, workers, 200),
+    ]
+    # Sanity: chunked and pooled runs must reproduce the single-chunk ranking exactly
+    agree = consistent(results)
+    for r in results:
+        r.pop("values")
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({"symbols": len(symbols), "days": N_DAYS, "results": results,
+                      "consistent": agree, "peakRssMb": round(peak_kb / 1024, 1)}, indent=2))
+    sys.exit(0 if agree else 1)
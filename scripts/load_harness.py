@@ -0,0 +1,523 @@
+#!/usr/bin/env python
+import sys
+import os
+import json
+import math
+import time
+import heapq
+import random
+import shutil
+import signal
+import tempfile
+import threading
+import subprocess
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Any, Optional
+from zoneinfo import ZoneInfo
+
+# ---- Client schedules (mirror what a mounted dashboard tab actually requests) ----
+# Paths get {symbols} (the client's watchlist), {symbol} (its selected ticker) and {r}/{i}
+# (rangeConfig in src/app/(dash)/page.tsx); "{each}" expands to one request per watchlist
+# symbol. "every" is a refetch interval in seconds; None means the request only fires on
+# mount and again whenever the tab's selection or range changes (see --change-every).
+#   quotes:    WatchlistTable's useQuotes, refetched every quotesInterval (15s)
+#   sentiment: SentimentCard, the selected ticker plus the whole watchlist
+#   ohlc:      the chart's selected stock plus one fetch per watchlist symbol
+SCHEDULES: Dict[str, Dict[str, Any]] = {
+    "quotes": {"paths": ["/api/quotes?symbols={symbols}"], "every": 15.0},
+    "sentiment": {"paths": ["/api/sentiment?ticker={symbol}&limit=30&force=true",
+                            "/api/sentiment?tickers={symbols}&limit=30&force=true"], "every": None},
+    "ohlc": {"paths": ["/api/ohlc?ticker={symbol}&range={r}&interval={i}&force=true",
+                       "/api/ohlc?ticker={each}&range={r}&interval={i}&force=true"], "every": None},
+}
+RANGES = {"1D": ("1d", "5m"), "1W": ("7d", "1h"), "1M": ("30d", "1d"), "1Y": ("365d", "1d")}
+DEFAULT_RANGE = "1M"
+SYMBOL_POOL = ["AAPL", "MSFT", "NVDA", "GOOGL", "AMZN", "META", "TSLA", "TSM", "AMD", "NFLX",
+               "JPM", "V", "XOM", "UNH", "SPY", "QQQ"]
+WATCHLIST_SIZE = 5
+ET = ZoneInfo("America/New_York")
+
+# Metrics compared against a baseline (all lower-is-better)
+BASELINE_METRICS = [
+    "latency.overall.p50", "latency.overall.p95", "latency.overall.p99",
+    "python.spawnsPerSec", "python.peakRssMbMax", "upstream.perSec",
+]
+
+
+def percentile(values: List[float], p: float) -> Optional[float]:
+    """Nearest-rank percentile; None for an empty sample."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    k = max(0, min(len(ordered) - 1, int(math.ceil(p / 100.0 * len(ordered))) - 1))
+    return round(ordered[k], 2)
+
+
+# ---- Upstream stand-in (Yahoo chart/quote/news endpoints used by scripts/loadtest/yfinance.py) ----
+
+def _period_days(period: str) -> int:
+    units = {"d": 1, "wk": 7, "mo": 30, "y": 365}
+    for suffix, mult in units.items():
+        if period.endswith(suffix) and period[:-len(suffix)].isdigit():
+            return int(period[:-len(suffix)]) * mult
+    return 365
+
+
+def _interval_minutes(interval: str) -> int:
+    if interval.endswith("m") and interval[:-1].isdigit():
+        return int(interval[:-1])
+    if interval.endswith("h") and interval[:-1].isdigit():
+        return int(interval[:-1]) * 60
+    return {"1d": 1440, "1wk": 10080, "1mo": 43200}.get(interval, 1440)
+
+
+def synthetic_bars(symbol: str, period: str, interval: str) -> List[List[float]]:
+    """Deterministic random-walk OHLCV; intraday bars cover 04:00-20:00 ET on weekdays."""
+    rng = random.Random(symbol)
+    step = _interval_minutes(interval)
+    end = datetime.now(ET).replace(second=0, microsecond=0)
+    start = end - timedelta(days=_period_days(period))
+    if step >= 1440:
+        t = start.replace(hour=0, minute=0)
+        delta = timedelta(minutes=step)
+    else:
+        t = start.replace(hour=4, minute=0)
+        delta = timedelta(minutes=step)
+    bars = []
+    price = 50.0 + rng.random() * 400.0
+    while t <= end:
+        if t.weekday() < 5 and (step >= 1440 or 4 <= t.hour < 20):
+            o = price
+            price *= math.exp(rng.gauss(0.0, 0.002 if step < 1440 else 0.015))
+            hi = max(o, price) * (1 + rng.random() * 0.002)
+            lo = min(o, price) * (1 - rng.random() * 0.002)
+            bars.append([int(t.timestamp() * 1000), round(o, 4), round(hi, 4), round(lo, 4),
+                         round(price, 4), float(rng.randint(10_000, 2_000_000))])
+        t += delta
+    return bars
+
+
+class Upstream:
+    """Counting HTTP stand-in; also collects the per-process reports from the yfinance stub."""
+
+    def __init__(self, latency_ms: float = 80.0):
+        self.latency = latency_ms / 1000.0
+        self.lock = threading.Lock()
+        self.calls: Dict[str, int] = defaultdict(int)
+        self.procs: List[Dict[str, Any]] = []
+        self.server: Optional[ThreadingHTTPServer] = None
+
+    def reset(self) -> None:
+        with self.lock:
+            self.calls.clear()
+            self.procs.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            return {"calls": dict(self.calls), "procs": list(self.procs)}
+
+    def handle(self, method: str, path: str, query: Dict[str, str], body: bytes):
+        parts = [p for p in path.split("/") if p]
+        if method == "POST" and parts == ["__proc"]:
+            with self.lock:
+                self.procs.append(json.loads(body or b"{}"))
+            return 200, {"ok": True}
+        if method != "GET" or not parts:
+            return 404, {"error": "not found"}
+
+        kind = parts[0]
+        with self.lock:
+            self.calls[kind] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        sym = parts[1] if len(parts) > 1 else ""
+        period = query.get("period", "1mo")
+        interval = query.get("interval", "1d")
+        if kind == "chart":
+            return 200, {"bars": synthetic_bars(sym, period, interval)}
+        if kind == "download":
+            return 200, {s: synthetic_bars(s, period, interval) for s in query.get("symbols", "").split(",") if s}
+        if kind == "quote":
+            closes = synthetic_bars(sym, "5d", "1d")
+            last = closes[-1][4] * (1 + random.gauss(0.0, 0.001))
+            return 200, {"last_price": last, "previous_close": closes[-2][4] if len(closes) > 1 else last}
+        if kind == "info":
+            return 200, {"longName": f"{sym} Inc.", "shortName": sym, "sector": "Technology", "industry": "Software"}
+        if kind == "news":
+            now = int(time.time())
+            return 200, [{
+                "title": f"{sym} shares {'rise' if i % 2 else 'slip'} as investors weigh outlook ({i})",
+                "publisher": f"Wire {i % 4}",
+                "providerPublishTime": now - i * 1800,
+                "link": f"https://news.example.com/{sym}/{i}",
+            } for i in range(12)]
+        return 404, {"error": "not found"}
+
+    def start(self, port: int = 0) -> str:
+        upstream = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _serve(self, method):
+                parsed = urllib.parse.urlparse(self.path)
+                query = {k: v[0] for k, v in urllib.parse.parse_qs(parsed.query).items()}
+                length = int(self.headers.get("Content-Length") or 0)
+                status, payload = upstream.handle(method, parsed.path, query, self.rfile.read(length) if length else b"")
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._serve("GET")
+
+            def do_POST(self):
+                self._serve("POST")
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def stop(self) -> None:
+        if self.server:
+            self.server.shutdown()
+
+
+# ---- App server ----
+
+def _tree_rss_kb(root_pid: int) -> Optional[int]:
+    """RSS of a process and its non-Python descendants from /proc (Linux only)."""
+    if not os.path.isdir("/proc"):
+        return None
+    children: Dict[int, List[int]] = defaultdict(list)
+    names: Dict[int, str] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "r") as f:
+                stat = f.read()
+            name = stat[stat.index("(") + 1:stat.rindex(")")]
+            ppid = int(stat[stat.rindex(")") + 2:].split()[1])
+        except (OSError, ValueError):
+            continue
+        names[int(entry)] = name
+        children[ppid].append(int(entry))
+    total = 0
+    stack = [root_pid]
+    while stack:
+        pid = stack.pop()
+        stack.extend(children.get(pid, []))
+        if names.get(pid, "").startswith("python"):
+            continue
+        try:
+            with open(f"/proc/{pid}/status", "r") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1])
+                        break
+        except OSError:
+            continue
+    return total
+
+
+def app_workdir(root: str) -> str:
+    """Throwaway working dir mirroring the app root minus tmp/, so every run starts cold.
+
+    The API routes and scripts keep their caches under <cwd>/tmp; linking everything else
+    (.next, node_modules, scripts, ...) lets `next start` run unchanged from the copy.
+    """
+    work = tempfile.mkdtemp(prefix="loadtest-")
+    for name in os.listdir(root):
+        if name != "tmp":
+            os.symlink(os.path.join(root, name), os.path.join(work, name))
+    return work
+
+
+def start_app(cmd: List[str], port: int, upstream_url: str, cwd: str) -> subprocess.Popen:
+    """Launch the Next.js server in `cwd` with the yfinance stand-in first on PYTHONPATH."""
+    env = dict(os.environ)
+    stub_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "loadtest")
+    env["PYTHONPATH"] = os.pathsep.join(p for p in [stub_dir, env.get("PYTHONPATH", "")] if p)
+    env["YF_STANDIN_URL"] = upstream_url
+    env["PORT"] = str(port)
+    return subprocess.Popen(cmd + ["-p", str(port)], cwd=cwd, env=env, stdout=subprocess.DEVNULL,
+                            stderr=subprocess.DEVNULL, start_new_session=True)
+
+
+def wait_ready(base: str, timeout: float = 180.0) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f"{base}/api/news", timeout=5) as r:
+                if r.status == 200:
+                    return
+        except Exception:
+            time.sleep(1.0)
+    raise RuntimeError(f"App at {base} not ready after {timeout:.0f}s")
+
+
+# ---- Simulated clients ----
+
+def client_urls(base: str, sched: Dict[str, Any], params: Dict[str, str], watchlist: List[str]) -> List[str]:
+    urls = []
+    for path in sched["paths"]:
+        if "{each}" in path:
+            urls += [base + path.format(each=sym, **params) for sym in watchlist]
+        else:
+            urls.append(base + path.format(**params))
+    return urls
+
+
+def run_clients(base: str, clients: int, duration: float, schedules: Dict[str, Dict[str, Any]],
+                seed: int = 7, timeout: float = 60.0, change_every: float = 0.0) -> Dict[str, Any]:
+    """Drive `clients` tabs for `duration` s.
+
+    Every tab fires all schedules on mount (random phase), then polls the ones with an
+    interval. With `change_every`, each tab also picks a new selected ticker and range on
+    that cadence, which refires the mount-only schedules like a real selection change does.
+    """
+    rng = random.Random(seed)
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    lock = threading.Lock()
+
+    def request(name: str, url: str) -> None:
+        t0 = time.perf_counter()
+        ok = False
+        try:
+            with urllib.request.urlopen(url, timeout=timeout) as r:
+                r.read()
+                ok = r.status == 200
+        except (urllib.error.URLError, OSError):
+            ok = False
+        ms = (time.perf_counter() - t0) * 1000
+        with lock:
+            latencies[name].append(ms)
+            if not ok:
+                errors[name] += 1
+
+    def params_for(watchlist: List[str], symbol: str, range_key: str) -> Dict[str, str]:
+        r, i = RANGES[range_key]
+        return {"symbols": ",".join(watchlist), "symbol": symbol, "r": r, "i": i}
+
+    start = time.time()
+    # (due, client, schedule name or "__change__", urls)
+    queue = []
+    watchlists = {}
+    for c in range(clients):
+        watchlists[c] = rng.sample(SYMBOL_POOL, WATCHLIST_SIZE)
+        params = params_for(watchlists[c], watchlists[c][0], DEFAULT_RANGE)
+        mount = start + rng.random() * 2.0
+        for name, sched in schedules.items():
+            heapq.heappush(queue, (mount, c, name, client_urls(base, sched, params, watchlists[c])))
+        if change_every > 0:
+            heapq.heappush(queue, (mount + change_every * (0.5 + rng.random()), c, "__change__", []))
+
+    max_workers = min(512, max(8, clients * len(schedules) * (WATCHLIST_SIZE + 1)))
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while queue:
+            due, c, name, urls = heapq.heappop(queue)
+            if due - start > duration:
+                continue
+            delay = due - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            if name == "__change__":
+                watchlist = watchlists[c]
+                params = params_for(watchlist, rng.choice(watchlist), rng.choice(list(RANGES)))
+                for sched_name, sched in schedules.items():
+                    if sched["every"] is None:
+                        heapq.heappush(queue, (due, c, sched_name, client_urls(base, sched, params, watchlist)))
+                heapq.heappush(queue, (due + change_every, c, name, []))
+                continue
+            for url in urls:
+                pool.submit(request, name, url)
+            every = schedules[name]["every"]
+            if every:
+                heapq.heappush(queue, (due + every, c, name, urls))
+
+    everything = [ms for v in latencies.values() for ms in v]
+    out = {"overall": _latency_stats(everything, sum(errors.values()))}
+    for name in schedules:
+        out[name] = _latency_stats(latencies.get(name, []), errors.get(name, 0))
+    return out
+
+
+def _latency_stats(values: List[float], errors: int) -> Dict[str, Any]:
+    return {
+        "count": len(values),
+        "errors": errors,
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": round(max(values), 2) if values else None,
+    }
+
+
+# ---- Report & baseline ----
+
+def build_report(config: Dict[str, Any], latency: Dict[str, Any], upstream: Dict[str, Any],
+                 elapsed: float, server_rss: List[int]) -> Dict[str, Any]:
+    procs = upstream["procs"]
+    by_script: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for p in procs:
+        by_script[p.get("script", "?")].append(p)
+    rss_mb = [p.get("peakRssKb", 0) / 1024 for p in procs]
+    calls = upstream["calls"]
+    total_calls = sum(calls.values())
+    return {
+        "config": config,
+        "elapsedS": round(elapsed, 1),
+        "latency": latency,
+        "python": {
+            "spawns": len(procs),
+            "spawnsPerSec": round(len(procs) / elapsed, 3) if elapsed else None,
+            "peakRssMbMax": round(max(rss_mb), 1) if rss_mb else None,
+            "peakRssMbP95": percentile(rss_mb, 95),
+            "byScript": {
+                name: {
+                    "spawns": len(items),
+                    "peakRssMbMax": round(max(i.get("peakRssKb", 0) for i in items) / 1024, 1),
+                    "wallMsP50": percentile([(i["endedAt"] - i["startedAt"]) * 1000 for i in items], 50),
+                }
+                for name, items in sorted(by_script.items())
+            },
+        },
+        "upstream": {
+            "total": total_calls,
+            "perSec": round(total_calls / elapsed, 3) if elapsed else None,
+            "byKind": dict(sorted(calls.items())),
+        },
+        "server": {
+            "rssMbStart": round(server_rss[0] / 1024, 1) if server_rss else None,
+            "rssMbPeak": round(max(server_rss) / 1024, 1) if server_rss else None,
+            "rssMbEnd": round(server_rss[-1] / 1024, 1) if server_rss else None,
+        },
+    }
+
+
+def _lookup(report: Dict[str, Any], dotted: str) -> Optional[float]:
+    node: Any = report
+    for part in dotted.split("."):
+        if not isinstance(node, dict) or part not in node:
+            return None
+        node = node[part]
+    return node if isinstance(node, (int, float)) else None
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> Dict[str, Any]:
+    """Relative change per metric; a metric regresses when it grows by more than `tolerance`."""
+    metrics = list(BASELINE_METRICS) + [f"latency.{name}.p95" for name in report["latency"] if name != "overall"]
+    rows = []
+    for m in metrics:
+        cur, base = _lookup(report, m), _lookup(baseline, m)
+        if cur is None or base is None:
+            continue
+        change = (cur - base) / base if base else (0.0 if cur == 0 else math.inf)
+        rows.append({"metric": m, "baseline": base, "current": cur,
+                     "change": round(change, 4) if math.isfinite(change) else None,
+                     "regressed": change > tolerance})
+    return {"tolerance": tolerance, "metrics": rows, "regressed": [r["metric"] for r in rows if r["regressed"]]}
+
+
+USAGE = ("Usage: python load_harness.py [--clients N] [--duration S] [--base URL | --server-cmd CMD] "
+         "[--port P] [--change-every S] [--upstream-latency MS] [--save-baseline FILE] [--baseline FILE] [--tolerance F]")
+
+
+def parse_args(args: List[str]) -> Dict[str, str]:
+    opts = {
+        "clients": "50", "duration": "300", "base": "", "server-cmd": "npx next start", "port": "3100",
+        "upstream-latency": "80", "save-baseline": "", "baseline": "", "tolerance": "0.2", "seed": "7",
+        "change-every": "0",
+    }
+    i = 0
+    while i < len(args):
+        key = args[i][2:] if args[i].startswith("--") else ""
+        if key not in opts or i + 1 >= len(args):
+            raise ValueError(USAGE)
+        opts[key] = args[i + 1]
+        i += 2
+    return opts
+
+
+if __name__ == "__main__":
+    try:
+        opts = parse_args(sys.argv[1:])
+    except ValueError as e:
+        print(json.dumps({"error": str(e)}))
+        sys.exit(1)
+
+    upstream = Upstream(float(opts["upstream-latency"]))
+    upstream_url = upstream.start()
+    app = None
+    workdir = None
+    base = opts["base"].rstrip("/")
+    if not base:
+        # The app must already be built (`npm run build`) for `next start`; it runs from a
+        # throwaway cwd so no tmp/ cache from earlier runs or development leaks into the numbers
+        port = int(opts["port"])
+        workdir = app_workdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        app = start_app(opts["server-cmd"].split(), port, upstream_url, workdir)
+        base = f"http://127.0.0.1:{port}"
+
+    server_rss: List[int] = []
+    stop = threading.Event()
+    try:
+        wait_ready(base)
+        upstream.reset()  # don't count warm-up
+
+        def sample_rss():
+            while app and not stop.is_set():
+                rss = _tree_rss_kb(app.pid)
+                if rss is not None:
+                    server_rss.append(rss)
+                stop.wait(5.0)
+
+        threading.Thread(target=sample_rss, daemon=True).start()
+        t0 = time.time()
+        latency = run_clients(base, int(opts["clients"]), float(opts["duration"]), SCHEDULES,
+                              int(opts["seed"]), change_every=float(opts["change-every"]))
+        elapsed = time.time() - t0
+        time.sleep(1.0)  # let in-flight scripts report their exit
+    finally:
+        stop.set()
+        if app:
+            os.killpg(app.pid, signal.SIGTERM)
+            try:
+                app.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                os.killpg(app.pid, signal.SIGKILL)
+        if workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+        upstream.stop()
+
+    config = {"clients": int(opts["clients"]), "durationS": float(opts["duration"]),
+              "upstreamLatencyMs": float(opts["upstream-latency"]),
+              "schedules": {k: v["every"] for k, v in SCHEDULES.items()},
+              "changeEveryS": float(opts["change-every"]),
+              "at": datetime.now(timezone.utc).replace(microsecond=0).isoformat()}
+    report = build_report(config, latency, upstream.snapshot(), elapsed, server_rss)
+
+    code = 0
+    if opts["baseline"]:
+        with open(opts["baseline"], "r", encoding="utf-8") as f:
+            report["comparison"] = compare(report, json.load(f), float(opts["tolerance"]))
+        code = 1 if report["comparison"]["regressed"] else 0
+    if opts["save-baseline"]:
+        with open(opts["save-baseline"], "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    print(json.dumps(report, indent=2))
+    sys.exit(code)
@@ -0,0 +1,92 @@
+"""Stand-in for the yfinance package used by scripts/load_harness.py.
+
+The harness puts this directory first on PYTHONPATH for the Next.js server it launches, so
+every Python script the API routes spawn imports this module instead of the real one. All
+data comes from the harness's local upstream (YF_STANDIN_URL), which counts each call, and
+each process reports its argv and peak RSS there on exit.
+"""
+import os
+import sys
+import json
+import time
+import atexit
+import resource
+import urllib.parse
+import urllib.request
+import pandas as pd
+
+BASE = os.environ.get("YF_STANDIN_URL", "http://127.0.0.1:8766").rstrip("/")
+_STARTED = time.time()
+
+
+def _get(path, **params):
+    url = f"{BASE}{path}"
+    if params:
+        url += "?" + urllib.parse.urlencode(params)
+    with urllib.request.urlopen(url, timeout=10) as r:
+        return json.loads(r.read())
+
+
+def _report_process():
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    body = json.dumps({
+        "pid": os.getpid(),
+        "script": os.path.basename(sys.argv[0]) if sys.argv else "",
+        "argv": sys.argv[1:],
+        "startedAt": _STARTED,
+        "endedAt": time.time(),
+        "peakRssKb": peak_kb,
+    }).encode("utf-8")
+    try:
+        req = urllib.request.Request(f"{BASE}/__proc", data=body, method="POST",
+                                     headers={"Content-Type": "application/json"})
+        urllib.request.urlopen(req, timeout=2).read()
+    except Exception:
+        pass
+
+
+atexit.register(_report_process)
+
+
+def _frame(bars):
+    idx = pd.to_datetime([b[0] for b in bars], unit="ms", utc=True).tz_convert("America/New_York")
+    return pd.DataFrame(
+        [b[1:] for b in bars], index=idx, columns=["Open", "High", "Low", "Close", "Volume"]
+    )
+
+
+class Ticker:
+    def __init__(self, symbol):
+        self.ticker = symbol.upper()
+        self._fast_info = None
+        self._info = None
+
+    # Cached per instance like the real lazy-loading properties
+    @property
+    def fast_info(self):
+        if self._fast_info is None:
+            self._fast_info = _get(f"/quote/{self.ticker}")
+        return self._fast_info
+
+    @property
+    def info(self):
+        if self._info is None:
+            self._info = _get(f"/info/{self.ticker}")
+        return self._info
+
+    @property
+    def news(self):
+        return _get(f"/news/{self.ticker}")
+
+    def history(self, period="1mo", interval="1d", **kwargs):
+        return _frame(_get(f"/chart/{self.ticker}", period=period, interval=interval)["bars"])
+
+
+def download(tickers, period="1y", interval="1d", group_by="column", **kwargs):
+    symbols = tickers.split() if isinstance(tickers, str) else list(tickers)
+    # One upstream call per batch, like the real bulk endpoint
+    bars = _get("/download", symbols=",".join(symbols), period=period, interval=interval)
+    frames = {s: _frame(b) for s, b in bars.items() if b}
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, axis=1).swaplevel(0, 1, axis=1).sort_index(axis=1)
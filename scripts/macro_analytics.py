@@ -0,0 +1,221 @@
+#!/usr/bin/env python
+import sys
+import os
+import json
+import time
+import tempfile
+from typing import Dict, List, Any, Optional
+import numpy as np
+from policy_ingest import SOURCES, STORE_DIR, ingest, load_series
+
+# --- Constants ---
+SUMMARY_FILE = os.path.join(os.getcwd(), "tmp", "macro_summary.json")
+ZSCORE_YEARS = 5             # rolling z-score lookback, matches the routes' 60-month window
+DELTA_DAYS = {"1d": 1, "1w": 7, "1m": 28}
+DELTA_SLACK_DAYS = 4         # tolerate weekends/holidays when finding the reference point
+COLUMNS = ["date", "value", "z", "pctRank", "delta1d", "delta1w", "delta1m"]
+
+# Headline numbers exactly as each dashboard route defines them, so the precomputed path and
+# the routes' download fallback agree. "level": latest value, % change vs `lag` observations
+# back, z of latest vs the last `window` values. "smoothed" (trade-pulse): EMA-`ema` over the
+# last `tail` values, last-`avg` vs prior-`avg` mean % change, z of the EMA vs `window` values.
+PULSE = {
+    "epu": {"kind": "level", "lag": 3, "window": 60, "ddof": 1},       # political-pulse "policy"
+    "eputrade": {"kind": "level", "lag": 1, "window": 60, "ddof": 1},  # political-pulse "trade"
+    "gpr": {"kind": "level", "lag": 1, "window": 60, "ddof": 1},       # geopolitics
+    "tpu": {"kind": "smoothed", "ema": 7, "tail": 30, "avg": 7, "window": 1825, "ddof": 0},  # trade-pulse
+}
+
+
+def rolling_zscore(values: np.ndarray, window: int) -> np.ndarray:
+    """Z-score of each point against the trailing `window` points (sample sd), via cumulative sums."""
+    n = len(values)
+    c1 = np.concatenate(([0.0], np.cumsum(values)))
+    c2 = np.concatenate(([0.0], np.cumsum(values * values)))
+    end = np.arange(1, n + 1)
+    start = np.maximum(0, end - window)
+    count = end - start
+    s1 = c1[end] - c1[start]
+    s2 = c2[end] - c2[start]
+    mean = s1 / count
+    var = (s2 - s1 * mean) / np.maximum(1, count - 1)
+    sd = np.sqrt(np.clip(var, 0.0, None))
+    sd[sd == 0] = 1.0
+    return (values - mean) / sd
+
+
+def percentile_rank(values: np.ndarray) -> np.ndarray:
+    """Share (0..100) of the full history at or below each value."""
+    ordered = np.sort(values)
+    return np.searchsorted(ordered, values, side="right") * 100.0 / len(values)
+
+
+def pct_delta(dates: np.ndarray, values: np.ndarray, days: int) -> np.ndarray:
+    """% change vs the last observation at least `days` earlier; NaN if the series is too sparse."""
+    ref = np.searchsorted(dates, dates - np.timedelta64(days, "D"), side="right") - 1
+    ok = ref >= 0
+    ref = np.where(ok, ref, 0)
+    gap = (dates - dates[ref]).astype("timedelta64[D]").astype(np.int64)
+    ok &= gap <= days + DELTA_SLACK_DAYS
+    base = values[ref]
+    ok &= base != 0
+    out = np.full(len(values), np.nan)
+    out[ok] = (values[ok] - base[ok]) / np.abs(base[ok]) * 100.0
+    return out
+
+
+def compute_columns(points: List[List[Any]]) -> Dict[str, np.ndarray]:
+    dates = np.array([p[0] for p in points], dtype="datetime64[D]")
+    values = np.array([p[1] for p in points], dtype=np.float64)
+    spacing = float(np.median(np.diff(dates).astype(np.int64))) if len(dates) > 1 else 1.0
+    window = max(2, int(round(ZSCORE_YEARS * 365.25 / max(spacing, 1.0))))
+    cols = {
+        "date": dates,
+        "value": values,
+        "z": rolling_zscore(values, window),
+        "pctRank": percentile_rank(values),
+    }
+    for name, days in DELTA_DAYS.items():
+        cols[f"delta{name}"] = pct_delta(dates, values, days)
+    return cols
+
+
+def _num(x: float, digits: int = 4) -> Optional[float]:
+    return None if not np.isfinite(x) else round(float(x), digits)
+
+
+def _z(latest: float, arr: np.ndarray, ddof: int) -> float:
+    mean = arr.mean()
+    sd = float(np.sqrt(((arr - mean) ** 2).sum() / max(1, len(arr) - ddof))) or 1.0
+    return (latest - mean) / sd
+
+
+def pulse_metrics(key: str, cols: Dict[str, np.ndarray]) -> Optional[Dict[str, Any]]:
+    """The route-facing value/deltaPct/z for one series (see PULSE)."""
+    spec = PULSE.get(key)
+    values = cols["value"]
+    if spec is None or len(values) < 2:
+        return None
+    as_of = str(cols["date"][-1])
+
+    if spec["kind"] == "level":
+        latest = float(values[-1])
+        prev = float(values[-1 - spec["lag"]]) if len(values) > spec["lag"] else float(values[-2])
+        delta = (latest - prev) / abs(prev) * 100.0 if prev else 0.0
+        z = _z(latest, values[-spec["window"]:], spec["ddof"])
+        return {"value": _num(latest), "deltaPct": _num(delta, 4), "z": _num(z), "asOf": as_of}
+
+    n = spec["avg"]
+    if len(values) < 2 * n:
+        # Too short for the 7d-vs-7d comparison; the route shows the raw latest at "Medium"
+        return {"value": _num(values[-1]), "deltaPct": 0.0, "z": None, "asOf": as_of}
+    tail = values[-spec["tail"]:]
+    alpha = 2.0 / (spec["ema"] + 1)
+    ema = float(tail[0])
+    for v in tail[1:]:
+        ema = alpha * float(v) + (1 - alpha) * ema
+    prior = float(tail[-2 * n:-n].mean())
+    delta = (float(tail[-n:].mean()) - prior) / prior * 100.0 if prior else 0.0
+    z = _z(ema, values[-spec["window"]:], spec["ddof"])
+    return {"value": _num(ema), "deltaPct": _num(delta, 4), "z": _num(z), "asOf": as_of}
+
+
+def summarize(key: str, cols: Dict[str, np.ndarray]) -> Dict[str, Any]:
+    """The tiny record the dashboard routes read: latest row of every precomputed column."""
+    return {
+        "key": key,
+        "label": SOURCES[key]["label"],
+        "asOf": str(cols["date"][-1]),
+        "value": _num(cols["value"][-1]),
+        "z": _num(cols["z"][-1]),
+        "pctRank": _num(cols["pctRank"][-1], 2),
+        "delta1d": _num(cols["delta1d"][-1], 2),
+        "delta1w": _num(cols["delta1w"][-1], 2),
+        "delta1m": _num(cols["delta1m"][-1], 2),
+        "points": int(len(cols["value"])),
+        "pulse": pulse_metrics(key, cols),
+        "checkedAt": int(time.time() * 1000),
+    }
+
+
+def load_summary(path: str = SUMMARY_FILE) -> Dict[str, Any]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"computedAt": None, "checkedAt": None, "series": {}}
+
+
+def _write_summary(summary: Dict[str, Any], path: str = SUMMARY_FILE) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(summary, f)
+    os.replace(tmp_path, path)
+
+
+def load_columns(key: str, store_dir: str = STORE_DIR) -> Optional[Dict[str, np.ndarray]]:
+    """Read the columnar analytics file for one series."""
+    try:
+        with np.load(os.path.join(store_dir, f"{key}.npz")) as f:
+            return {c: f[c] for c in COLUMNS}
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def precompute(keys: Optional[List[str]] = None, store_dir: str = STORE_DIR,
+               summary_path: str = SUMMARY_FILE) -> Dict[str, Any]:
+    """Recompute the analytics columns for the given series and merge them into the summary."""
+    summary = load_summary(summary_path)
+    for key in keys or list(SOURCES):
+        series = load_series(key, store_dir)
+        if not series or len(series.get("points", [])) < 2:
+            continue
+        cols = compute_columns(series["points"])
+        fd, tmp_path = tempfile.mkstemp(dir=store_dir, suffix=".npz")
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, **cols)
+        os.replace(tmp_path, os.path.join(store_dir, f"{key}.npz"))
+        summary["series"][key] = summarize(key, cols)
+
+    summary["computedAt"] = int(time.time() * 1000)
+    _write_summary(summary, summary_path)
+    return summary
+
+
+def refresh(store_dir: str = STORE_DIR, summary_path: str = SUMMARY_FILE) -> Dict[str, Any]:
+    """Ingest, recompute what changed, and stamp every series the upstream confirmed as current.
+
+    A 304/unchanged answer still proves the record is up to date, so its `checkedAt` moves
+    forward; the routes judge staleness by that, not by when data last changed.
+    """
+    results = ingest(store_dir=store_dir,
+                     on_update=lambda keys: precompute(keys, store_dir, summary_path))
+    summary = load_summary(summary_path)
+    missing = [k for k in results if k not in summary["series"]]
+    if missing:
+        # e.g. summary deleted while the store is intact and every source answered 304
+        summary = precompute(missing, store_dir, summary_path)
+    now = int(time.time() * 1000)
+    for key, meta in results.items():
+        rec = summary["series"].get(key)
+        if rec and meta.get("status") in ("updated", "not-modified", "unchanged"):
+            rec["checkedAt"] = now
+    summary["checkedAt"] = now
+    _write_summary(summary, summary_path)
+    return summary
+
+
+if __name__ == "__main__":
+    # refresh: ingest and recompute only what changed; rebuild: recompute everything in the store.
+    # Run from the repo root (`npm run macro:refresh`, e.g. hourly from cron); the header's
+    # Refresh button (POST /api/refresh) also kicks one off in the background.
+    cmd = sys.argv[1] if len(sys.argv) > 1 else "refresh"
+    if cmd == "refresh":
+        print(json.dumps(refresh()))
+        sys.exit(0)
+    elif cmd == "rebuild":
+        print(json.dumps(precompute()))
+        sys.exit(0)
+    print(json.dumps({"error": "Usage: python macro_analytics.py [refresh | rebuild]"}))
+    sys.exit(1)
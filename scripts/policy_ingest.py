@@ -0,0 +1,418 @@
+#!/usr/bin/env python
+import sys
+import os
+import json
+import time
+import hashlib
+import shutil
+import tempfile
+import threading
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Any, Optional, Callable
+import requests
+
+# --- Store layout ---
+STORE_DIR = os.path.join(os.getcwd(), "tmp", "policy")
+META_FILE = "_meta.json"
+USER_AGENT = "Market-Dashboard/1.0"
+
+# Point every source at a local stand-in, e.g. http://127.0.0.1:8765 (see `serve` below)
+SOURCE_BASE = os.environ.get("POLICY_SOURCE_BASE", "").rstrip("/")
+
+
+def parse_fred_csv(body: bytes, column: str) -> List[List[Any]]:
+    """fredgraph.csv: DATE/observation_date plus one value column, '.' for missing."""
+    lines = body.decode("utf-8", errors="replace").strip().splitlines()
+    if len(lines) < 2:
+        return []
+    headers = [h.strip() for h in lines[0].split(",")]
+    idx = next((i for i, h in enumerate(headers) if h.upper() == column.upper()), -1)
+    if idx == -1:
+        raise ValueError(f"{column} column not found")
+    points = []
+    for line in lines[1:]:
+        row = line.split(",")
+        if len(row) <= idx:
+            continue
+        try:
+            points.append([row[0].strip()[:10], float(row[idx])])
+        except ValueError:
+            continue
+    return points
+
+
+def parse_tpu_csv(body: bytes) -> List[List[Any]]:
+    """Daily TPU file: day, month, year columns followed by daily_tpu_index."""
+    lines = body.decode("utf-8", errors="replace").strip().splitlines()
+    if len(lines) < 2:
+        return []
+    headers = [h.strip().lower() for h in lines[0].split(",")]
+    idx = next((i for i, h in enumerate(headers) if "united states" in h), -1)
+    if idx == -1:
+        idx = next((i for i, h in enumerate(headers) if "daily_tpu_index" in h), -1)
+    if idx == -1:
+        raise ValueError("US column not found")
+    points = []
+    for line in lines[1:]:
+        row = line.split(",")
+        if len(row) <= idx:
+            continue
+        try:
+            day, month, year = int(row[0]), int(row[1]), int(row[2])
+            points.append([f"{year:04d}-{month:02d}-{day:02d}", float(row[idx])])
+        except ValueError:
+            continue
+    return points
+
+
+def parse_gpr_xls(body: bytes) -> List[List[Any]]:
+    """GPR export: prefer GPRC_USA, fall back to the headline GPR column."""
+    import pandas as pd
+    try:
+        import xlrd  # noqa: F401  (pandas' reader for legacy .xls)
+    except ImportError:
+        raise ImportError("reading data_gpr_export.xls requires xlrd (pip install xlrd)")
+
+    df = pd.read_excel(BytesIO(body))
+    cols = {str(c).strip().lower(): c for c in df.columns}
+    date_col = next((cols[c] for c in cols if c in ("month", "date")), df.columns[0])
+    value_col = cols.get("gprc_usa") or cols.get("gpr")
+    if value_col is None:
+        raise ValueError("GPR column not found")
+    dates = pd.to_datetime(df[date_col], errors="coerce")
+    values = pd.to_numeric(df[value_col], errors="coerce")
+    points = []
+    for d, v in zip(dates, values):
+        if pd.isna(d) or pd.isna(v):
+            continue
+        points.append([d.strftime("%Y-%m-%d"), float(v)])
+    return points
+
+
+# Each source is fetched once per run; timeouts are (connect, read) seconds and
+# max_age_hrs is how long a copy may go unchecked before the report calls it stale.
+SOURCES: Dict[str, Dict[str, Any]] = {
+    "epu": {
+        "label": "Economic Policy Uncertainty (daily)",
+        "url": "https://fred.stlouisfed.org/graph/fredgraph.csv?id=USEPUINDXD",
+        "file": "USEPUINDXD.csv",
+        "parse": lambda b: parse_fred_csv(b, "USEPUINDXD"),
+        "timeout": (5, 20),
+        "max_age_hrs": 24,
+    },
+    "eputrade": {
+        "label": "Trade Policy Uncertainty (monthly)",
+        "url": "https://fred.stlouisfed.org/graph/fredgraph.csv?id=EPUTRADE",
+        "file": "EPUTRADE.csv",
+        "parse": lambda b: parse_fred_csv(b, "EPUTRADE"),
+        "timeout": (5, 20),
+        "max_age_hrs": 24,
+    },
+    "tpu": {
+        "label": "Trade Policy Uncertainty (daily)",
+        "url": "https://policyuncertainty.com/media/All_Daily_TPU_Data.csv",
+        "file": "All_Daily_TPU_Data.csv",
+        "parse": parse_tpu_csv,
+        "timeout": (5, 30),
+        "max_age_hrs": 24,
+    },
+    "gpr": {
+        "label": "Geopolitical Risk (monthly)",
+        "url": "https://www.matteoiacoviello.com/gpr_files/data_gpr_export.xls",
+        "file": "data_gpr_export.xls",
+        "parse": parse_gpr_xls,
+        "timeout": (5, 45),
+        "max_age_hrs": 24,
+        "requires": ["pandas", "xlrd"],
+    },
+}
+
+
+def source_url(key: str, base: Optional[str] = None) -> str:
+    src = SOURCES[key]
+    base = (base or SOURCE_BASE).rstrip("/")
+    return f"{base}/{src['file']}" if base else src["url"]
+
+
+def _write_json(path: str, data: Any) -> None:
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def load_meta(store_dir: str = STORE_DIR) -> Dict[str, Dict[str, Any]]:
+    try:
+        with open(os.path.join(store_dir, META_FILE), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def load_series(key: str, store_dir: str = STORE_DIR) -> Optional[Dict[str, Any]]:
+    """Read one normalized series ({key, label, points: [[date, value], ...]}) from the store."""
+    try:
+        with open(os.path.join(store_dir, f"{key}.json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def fetch_source(key: str, prev: Dict[str, Any], store_dir: str = STORE_DIR,
+                 record_dir: Optional[str] = None, base: Optional[str] = None) -> Dict[str, Any]:
+    """Conditionally fetch one source and re-parse it only when the body changed."""
+    src = SOURCES[key]
+    now = int(time.time())
+    meta = dict(prev)
+    meta["checkedAt"] = now
+    meta.pop("error", None)
+
+    headers = {"User-Agent": USER_AGENT}
+    have_copy = os.path.exists(os.path.join(store_dir, f"{key}.json"))
+    if have_copy and prev.get("etag"):
+        headers["If-None-Match"] = prev["etag"]
+    if have_copy and prev.get("lastModified"):
+        headers["If-Modified-Since"] = prev["lastModified"]
+
+    started = time.time()
+    try:
+        r = requests.get(source_url(key, base), headers=headers, timeout=src["timeout"])
+        meta["elapsedMs"] = int((time.time() - started) * 1000)
+        if r.status_code == 304:
+            meta["status"] = "not-modified"
+            return meta
+        r.raise_for_status()
+
+        body = r.content
+        digest = hashlib.sha256(body).hexdigest()
+        # Validators only describe the stored copy once that body is in the store; saving them
+        # before a failed parse would turn the next fetch into a 304 for data we never kept.
+        validators = {"etag": r.headers.get("ETag"), "lastModified": r.headers.get("Last-Modified")}
+        if record_dir:
+            os.makedirs(record_dir, exist_ok=True)
+            with open(os.path.join(record_dir, src["file"]), "wb") as f:
+                f.write(body)
+
+        # Servers without validators still send identical bytes; skip the parse.
+        if have_copy and digest == prev.get("sha256"):
+            meta.update(validators)
+            meta["status"] = "unchanged"
+            return meta
+
+        points = src["parse"](body)
+        if not points:
+            raise ValueError("no observations parsed")
+        points.sort(key=lambda p: p[0])
+        _write_json(os.path.join(store_dir, f"{key}.json"), {
+            "key": key,
+            "label": src["label"],
+            "points": points,
+        })
+        meta.update(validators)
+        meta.update({
+            "status": "updated",
+            "sha256": digest,
+            "changedAt": now,
+            "points": len(points),
+            "latestDate": points[-1][0],
+        })
+    except Exception as e:
+        meta["status"] = "error"
+        meta["error"] = str(e)
+        meta["elapsedMs"] = int((time.time() - started) * 1000)
+    return meta
+
+
+def ingest(keys: Optional[List[str]] = None, store_dir: str = STORE_DIR,
+           record_dir: Optional[str] = None, base: Optional[str] = None,
+           on_update: Optional[Callable[[List[str]], None]] = None) -> Dict[str, Dict[str, Any]]:
+    """Fetch all (or the given) sources concurrently and persist the refreshed metadata."""
+    os.makedirs(store_dir, exist_ok=True)
+    keys = keys or list(SOURCES)
+    meta = load_meta(store_dir)
+
+    with ThreadPoolExecutor(max_workers=len(keys)) as pool:
+        futures = {k: pool.submit(fetch_source, k, meta.get(k, {}), store_dir, record_dir, base) for k in keys}
+        results = {k: f.result() for k, f in futures.items()}
+
+    meta.update(results)
+    _write_json(os.path.join(store_dir, META_FILE), meta)
+
+    updated = [k for k, m in results.items() if m.get("status") == "updated"]
+    if updated and on_update:
+        on_update(updated)
+    return results
+
+
+def freshness_report(store_dir: str = STORE_DIR) -> Dict[str, Any]:
+    """Summarize when each source was last checked/changed and whether it is stale."""
+    meta = load_meta(store_dir)
+    now = int(time.time())
+    items = []
+    for key, src in SOURCES.items():
+        m = meta.get(key, {})
+        checked = m.get("checkedAt")
+        age_hrs = round((now - checked) / 3600, 2) if checked else None
+        items.append({
+            "key": key,
+            "label": src["label"],
+            "status": m.get("status", "missing"),
+            "checkedAt": checked,
+            "changedAt": m.get("changedAt"),
+            "ageHours": age_hrs,
+            "stale": age_hrs is None or age_hrs > src["max_age_hrs"] or m.get("status") == "error",
+            "latestDate": m.get("latestDate"),
+            "points": m.get("points", 0),
+            "requires": src.get("requires", []),
+            "error": m.get("error"),
+        })
+    return {"asOf": now, "sources": items}
+
+
+class _RecordedHandler(SimpleHTTPRequestHandler):
+    """Serve recorded copies with ETag/Last-Modified and honour conditional requests."""
+
+    def do_GET(self):
+        path = self.translate_path(self.path.split("?", 1)[0])
+        if not os.path.isfile(path):
+            self.send_error(404)
+            return
+        with open(path, "rb") as f:
+            body = f.read()
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        mtime = int(os.path.getmtime(path))
+        last_modified = formatdate(mtime, usegmt=True)
+
+        not_modified = False
+        inm = self.headers.get("If-None-Match")
+        ims = self.headers.get("If-Modified-Since")
+        if inm is not None:
+            not_modified = etag in [t.strip() for t in inm.split(",")]
+        elif ims is not None:
+            try:
+                not_modified = int(parsedate_to_datetime(ims).timestamp()) >= mtime
+            except (TypeError, ValueError):
+                not_modified = False
+
+        self.send_response(304 if not_modified else 200)
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", last_modified)
+        if not_modified:
+            self.end_headers()
+            return
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_recorded(directory: str, port: int = 0) -> ThreadingHTTPServer:
+    """Start a background HTTP stand-in over `directory`; returns the running server."""
+    handler = lambda *a, **kw: _RecordedHandler(*a, directory=directory, **kw)
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# Minimal recorded copies for `check` when no recording directory is given
+SAMPLE_COPIES = {
+    "USEPUINDXD.csv": "observation_date,USEPUINDXD\n2025-01-02,110.5\n2025-01-03,.\n2025-01-06,121.0\n",
+    "EPUTRADE.csv": "observation_date,EPUTRADE\n2024-12-01,180.2\n2025-01-01,240.9\n",
+    "All_Daily_TPU_Data.csv": "day,month,year,daily_tpu_index\n2,1,2025,35.1\n3,1,2025,41.7\n",
+}
+
+
+def offline_check(record_dir: Optional[str] = None) -> Dict[str, Any]:
+    """Ingest against `serve_recorded`: the first run must update and the second must get 304s.
+
+    Then one copy is replaced by an unparsable body, which must keep failing (not turn into
+    a 304 for data that never reached the store) until the body changes again.
+    """
+    with tempfile.TemporaryDirectory() as work:
+        served = os.path.join(work, "recorded")
+        os.makedirs(served)
+        if record_dir:
+            for name in os.listdir(record_dir):
+                if os.path.isfile(os.path.join(record_dir, name)):
+                    shutil.copy2(os.path.join(record_dir, name), served)
+        else:
+            for name, text in SAMPLE_COPIES.items():
+                with open(os.path.join(served, name), "w", encoding="utf-8") as f:
+                    f.write(text)
+        keys = [k for k, src in SOURCES.items() if os.path.exists(os.path.join(served, src["file"]))]
+        if not keys:
+            raise ValueError(f"no recorded copies in {record_dir}")
+
+        server = serve_recorded(served)
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        store = os.path.join(work, "store")
+        broken = keys[0]
+        try:
+            first = ingest(keys, store_dir=store, base=base)
+            second = ingest(keys, store_dir=store, base=base)
+            with open(os.path.join(served, SOURCES[broken]["file"]), "wb") as f:
+                f.write(b"not,a,recorded,copy\n")
+            after_break = [ingest([broken], store_dir=store, base=base)[broken] for _ in range(2)]
+        finally:
+            server.shutdown()
+
+        failures = [f"{k}: first run {first[k].get('status')} ({first[k].get('error')})"
+                    for k in keys if first[k].get("status") != "updated"]
+        failures += [f"{k}: second run {second[k].get('status')}"
+                     for k in keys if second[k].get("status") != "not-modified"]
+        failures += [f"{broken}: run {i + 1} after a bad body {m.get('status')}"
+                     for i, m in enumerate(after_break) if m.get("status") != "error"]
+        return {"sources": keys, "ok": not failures, "failures": failures}
+
+
+USAGE = ("Usage: python policy_ingest.py [ingest [key ...] [--record DIR] | report | "
+         "serve DIR [port] | check [DIR]]. The gpr source (.xls) needs xlrd installed.")
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    cmd = args[0] if args else "ingest"
+
+    if cmd == "ingest":
+        rest = args[1:]
+        record_dir = None
+        if "--record" in rest:
+            i = rest.index("--record")
+            record_dir = rest[i + 1] if i + 1 < len(rest) else None
+            rest = rest[:i] + rest[i + 2:]
+        unknown = [k for k in rest if k not in SOURCES]
+        if unknown:
+            print(json.dumps({"error": f"Unknown source(s): {', '.join(unknown)}"}))
+            sys.exit(1)
+        ingest(rest or None, record_dir=record_dir)
+        print(json.dumps(freshness_report()))
+        sys.exit(0)
+    elif cmd == "report":
+        print(json.dumps(freshness_report()))
+        sys.exit(0)
+    elif cmd == "check":
+        result = offline_check(args[1] if len(args) > 1 else None)
+        print(json.dumps(result))
+        sys.exit(0 if result["ok"] else 1)
+    elif cmd == "serve" and len(args) > 1:
+        server = serve_recorded(args[1], int(args[2]) if len(args) > 2 else 8765)
+        print(json.dumps({"base": f"http://127.0.0.1:{server.server_address[1]}"}))
+        sys.stdout.flush()
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            server.shutdown()
+        sys.exit(0)
+
+    print(json.dumps({"error": USAGE}))
+    sys.exit(1)
@@ -0,0 +1,227 @@
+#!/usr/bin/env python
+import sys
+import os
+import copy
+import json
+import time
+import hashlib
+import tempfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from yfinance_history import get_bars
+
+# --- Constants ---
+BENCHMARK = "SPY"
+DEFAULT_WINDOW = 60          # trading days
+DEFAULT_DAYS = 365
+TRADING_DAYS = 252           # annualization for realized volatility
+RESYNC_EVERY = 500           # exact recompute cadence to cap floating-point drift
+STATE_DIR = os.path.join(os.getcwd(), "tmp", "corr")
+
+
+class RollingCorrelation:
+    """Rolling-window moments over aligned log returns, updated in O(N^2) per bar.
+
+    Column 0 is the benchmark. Running sums of returns and of their outer products are kept,
+    so appending a bar adds the new row and subtracts the one leaving the window instead of
+    recomputing the whole window.
+    """
+
+    def __init__(self, symbols: List[str], window: int = DEFAULT_WINDOW, benchmark: str = BENCHMARK):
+        self.symbols = list(symbols)
+        self.benchmark = benchmark
+        self.window = window
+        self.rows: deque = deque()
+        n = len(self.symbols) + 1
+        self.s1 = np.zeros(n)
+        self.s2 = np.zeros((n, n))
+        self._since_resync = 0
+
+    def load(self, returns: np.ndarray) -> None:
+        """Seed from a (bars, N+1) return matrix, keeping only the last `window` rows."""
+        tail = returns[-self.window:]
+        self.rows = deque(tail)
+        self.s1 = tail.sum(axis=0)
+        self.s2 = tail.T @ tail
+        self._since_resync = 0
+
+    def append(self, r: np.ndarray) -> None:
+        """Add one bar of returns (benchmark first) and drop the oldest bar if the window is full."""
+        self.rows.append(r)
+        self.s1 += r
+        self.s2 += np.outer(r, r)
+        if len(self.rows) > self.window:
+            old = self.rows.popleft()
+            self.s1 -= old
+            self.s2 -= np.outer(old, old)
+        self._since_resync += 1
+        if self._since_resync >= RESYNC_EVERY:
+            self.load(np.asarray(self.rows))
+
+    def save(self, path: str, as_of: str) -> None:
+        """Persist the window and running sums, tagged with the date of the last bar."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".npz")
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, rows=np.asarray(self.rows), s1=self.s1, s2=self.s2,
+                     symbols=np.array(self.symbols), window=self.window,
+                     since_resync=self._since_resync, as_of=as_of)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def restore(cls, path: str, symbols: List[str], window: int,
+                benchmark: str = BENCHMARK) -> Tuple[Optional["RollingCorrelation"], Optional[str]]:
+        """Engine saved for exactly these symbols/window and its last bar date, or (None, None)."""
+        try:
+            with np.load(path) as f:
+                if list(f["symbols"]) != list(symbols) or int(f["window"]) != window:
+                    return None, None
+                engine = cls(symbols, window, benchmark)
+                engine.rows = deque(f["rows"])
+                engine.s1 = f["s1"]
+                engine.s2 = f["s2"]
+                engine._since_resync = int(f["since_resync"])
+                return engine, str(f["as_of"])
+        except (OSError, KeyError, ValueError):
+            return None, None
+
+    def covariance(self) -> np.ndarray:
+        n = len(self.rows)
+        if n < 2:
+            return np.full_like(self.s2, np.nan)
+        mean = self.s1 / n
+        return (self.s2 - n * np.outer(mean, mean)) / (n - 1)
+
+    def stats(self) -> Dict[str, object]:
+        cov = self.covariance()
+        var = np.clip(np.diag(cov), 0.0, None)
+        sd = np.sqrt(var)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            corr = cov / np.outer(sd, sd)
+            beta = cov[0] / var[0]
+        np.fill_diagonal(corr, 1.0)
+        corr = np.clip(corr[1:, 1:], -1.0, 1.0)
+        vol = sd * np.sqrt(TRADING_DAYS) * 100.0
+
+        def clean(x):
+            return None if not np.isfinite(x) else round(float(x), 4)
+
+        return {
+            "symbols": self.symbols,
+            "window": self.window,
+            "bars": len(self.rows),
+            "corr": [[clean(v) for v in row] for row in corr],
+            "beta": {s: clean(b) for s, b in zip(self.symbols, beta[1:])},
+            "vol": {s: clean(v) for s, v in zip(self.symbols, vol[1:])},
+            "benchmarkVol": clean(vol[0]),
+        }
+
+
+def aligned_returns(symbols: List[str], days: int = DEFAULT_DAYS,
+                    benchmark: str = BENCHMARK) -> Tuple[List[str], pd.DataFrame]:
+    """Daily log returns for benchmark + symbols on the dates they all traded."""
+    names = list(dict.fromkeys([benchmark] + list(symbols)))
+    with ThreadPoolExecutor(max_workers=min(8, len(names))) as pool:
+        frames = list(pool.map(lambda s: get_bars(s, days, "1d"), names))
+
+    closes = {}
+    for sym, df in zip(names, frames):
+        if df is not None and not df.empty:
+            closes[sym] = df["Close"].set_axis(df.index.normalize())
+    if benchmark not in closes:
+        raise ValueError(f"No data for benchmark {benchmark}")
+    found = [s for s in names[1:] if s in closes]
+    px = pd.concat([closes[benchmark]] + [closes[s] for s in found], axis=1, join="inner")
+    rets = np.log(px).diff().iloc[1:]
+    rets.columns = [benchmark] + found
+    return found, rets
+
+
+def _state_path(symbols: List[str], window: int, benchmark: str = BENCHMARK) -> str:
+    key = hashlib.sha1(f"{benchmark}|{','.join(symbols)}|{window}".encode("utf-8")).hexdigest()[:16]
+    return os.path.join(STATE_DIR, f"{key}.npz")
+
+
+def correlation_matrix(symbols: List[str], window: int = DEFAULT_WINDOW,
+                       days: int = DEFAULT_DAYS) -> Dict[str, object]:
+    """Rolling stats for `symbols`, resuming the engine saved by the previous request.
+
+    Only completed bars are persisted: the latest bar may still be forming, so it is applied
+    to a copy of the engine for this response and appended for real once a newer bar exists.
+    Bars after the saved state's last date are appended; a missing state, a changed symbol
+    set/window, or a gap longer than the window falls back to a full seed.
+    """
+    symbols = list(dict.fromkeys(s.upper() for s in symbols))
+    found, rets = aligned_returns(symbols, days)
+    as_of = rets.index[-1].strftime("%Y-%m-%d") if len(rets) else None
+    rows = rets.to_numpy(dtype=np.float64)
+    done, dates = rows[:-1], rets.index[:-1].strftime("%Y-%m-%d")
+    path = _state_path(found, window)
+
+    engine, saved_as_of = RollingCorrelation.restore(path, found, window)
+    pos = dates.get_loc(saved_as_of) if engine and saved_as_of in dates else None
+    if pos is not None and len(done) - 1 - pos <= window:
+        for r in done[pos + 1:]:
+            engine.append(r)
+    else:
+        engine = RollingCorrelation(found, window)
+        engine.load(done)
+    if len(done):
+        try:
+            engine.save(path, dates[-1])
+        except OSError:
+            pass  # state is an optimization; the response is computed either way
+    if len(rows):
+        engine = copy.deepcopy(engine)
+        engine.append(rows[-1])
+
+    out = engine.stats()
+    out["missing"] = [s for s in symbols if s not in found and s != BENCHMARK]
+    out["asOf"] = as_of
+    out["updatedAt"] = int(time.time() * 1000)
+    return out
+
+
+def bench(n: int = 50, bars: int = 252, window: int = DEFAULT_WINDOW, seed: int = 7) -> Dict[str, float]:
+    """Full seed + per-bar incremental update timings on synthetic returns."""
+    rng = np.random.default_rng(seed)
+    rets = rng.normal(0.0, 0.015, size=(bars + 100, n + 1))
+    engine = RollingCorrelation([f"SYM{i}" for i in range(n)], window)
+
+    t0 = time.perf_counter()
+    engine.load(rets[:bars])
+    engine.stats()
+    full_ms = (time.perf_counter() - t0) * 1000
+
+    t0 = time.perf_counter()
+    for r in rets[bars:]:
+        engine.append(r)
+    append_us = (time.perf_counter() - t0) / 100 * 1e6
+    stats = engine.stats()
+
+    exact = np.corrcoef(rets[-window:, 1:].T)
+    drift = float(np.nanmax(np.abs(np.array(stats["corr"], dtype=float) - exact)))
+    return {"n": n, "bars": bars, "window": window, "seedMs": round(full_ms, 3),
+            "appendUs": round(append_us, 2), "maxAbsErr": drift}
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--bench":
+        n = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+        print(json.dumps(bench(n)))
+        sys.exit(0)
+    if len(sys.argv) < 2:
+        print(json.dumps({"error": "Usage: python yfinance_correlation.py <ticker1,ticker2,...> [window] [days] or --bench [n]"}))
+        sys.exit(1)
+    symbols = list(dict.fromkeys(s.strip().upper() for s in sys.argv[1].split(",") if s.strip()))
+    window = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_WINDOW
+    days = int(sys.argv[3]) if len(sys.argv) > 3 else DEFAULT_DAYS
+    try:
+        print(json.dumps(correlation_matrix(symbols, window, days)))
+        sys.exit(0)
+    except Exception as e:
+        print(json.dumps({"error": str(e)}))
+        sys.exit(1)
@@ -1,7 +1,201 @@
 #!/usr/bin/env python
 import sys
+import os
 import json
+import time
+import tempfile
 import yfinance as yf
+import pandas as pd
+
+# ---- Shared base series ----
+# Every range/interval is cut from one of two per-symbol base pulls kept under tmp/bars:
+# 5m bars for intraday charts and 1d bars for everything coarser. A full pull happens once
+# per symbol per session (ET date); within a session stale bases are topped up with a short
+# fetch and merged, so repeated chart requests never re-download overlapping history.
+BARS_DIR = os.path.join(os.getcwd(), "tmp", "bars")
+ET = "US/Eastern"
+BASES = {
+    # base interval: (max span yfinance serves, top-up period, seconds before a top-up)
+    "5m": (60, "1d", 60),
+    "1d": (3650, "5d", 900),
+}
+MIN_SPAN = {"5m": 14, "1d": 400}
+# Yahoo intervals we don't build map to the nearest one we do; anything else falls back to
+# default_interval() for the range
+INTERVAL_ALIASES = {"60m": "1h", "1w": "1wk", "1m": "5m", "2m": "5m", "90m": "1h",
+                    "5d": "1wk", "3mo": "1mo"}
+# target interval -> (base, pandas rule, resample kwargs); hourly bins start at :30 like Yahoo's
+RESAMPLE = {
+    "5m": ("5m", None, {}),
+    "15m": ("5m", "15min", {}),
+    "30m": ("5m", "30min", {}),
+    "1h": ("5m", "1h", {"offset": "30min"}),
+    "1d": ("1d", None, {}),
+    "1wk": ("1d", "W-MON", {"label": "left", "closed": "left"}),
+    "1mo": ("1d", "MS", {}),
+}
+OHLCV = {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}
+
+
+def default_interval(days: int) -> str:
+    if days <= 1:
+        return "5m"  # Use 5m for better intraday resolution
+    if days <= 7:
+        return "1h"
+    return "1d"
+
+
+def _session_date() -> str:
+    return pd.Timestamp.now(tz=ET).strftime("%Y-%m-%d")
+
+
+def _cache_path(symbol: str, base: str) -> str:
+    safe = "".join(ch if ch.isalnum() or ch in "._-" else "_" for ch in symbol.upper())
+    return os.path.join(BARS_DIR, f"{safe}_{base}.json")
+
+
+def _to_frame(rows) -> pd.DataFrame:
+    df = pd.DataFrame(rows, columns=["ts", "Open", "High", "Low", "Close", "Volume"])
+    df.index = pd.to_datetime(df.pop("ts").to_numpy(), unit="ms", utc=True).tz_convert(ET)
+    return df
+
+
+def _epoch_ms(index: pd.DatetimeIndex):
+    return (index - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(milliseconds=1)
+
+
+def _from_frame(df: pd.DataFrame):
+    ts = _epoch_ms(df.index).tolist()
+    return [[t, *vals] for t, vals in zip(ts, df[list(OHLCV)].astype(float).values.tolist())]
+
+
+def _download(symbol: str, base: str, period: str) -> pd.DataFrame:
+    # Use prepost=True to include pre/post market data for better coverage
+    df = yf.Ticker(symbol).history(period=period, interval=base, auto_adjust=True, prepost=True)
+    if df is None or df.empty:
+        return pd.DataFrame(columns=list(OHLCV))
+    df = df[list(OHLCV)].dropna(subset=["Close"])
+    df.index = df.index.tz_convert(ET) if df.index.tz is not None else df.index.tz_localize(ET)
+    return df
+
+
+def load_base(symbol: str, base: str, days: int) -> pd.DataFrame:
+    """Base bars covering at least `days`, pulled in full at most once per session."""
+    max_span, topup_period, ttl = BASES[base]
+    span = min(max(days + 7, MIN_SPAN[base]), max_span)
+    path = _cache_path(symbol, base)
+    now = time.time()
+
+    cached = None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        cached = None
+
+    if cached and cached.get("session") == _session_date() and cached.get("span", 0) >= span:
+        df = _to_frame(cached["bars"])
+        if now - cached.get("fetchedAt", 0) < ttl:
+            return df
+        fresh = _download(symbol, base, topup_period)
+        if not fresh.empty:
+            df = pd.concat([df[df.index < fresh.index[0]], fresh])
+        span = cached["span"]
+    else:
+        df = _download(symbol, base, f"{span}d")
+
+    if not df.empty:
+        _write_base(path, {"session": _session_date(), "span": span, "fetchedAt": now, "bars": _from_frame(df)})
+    return df
+
+
+def _write_base(path: str, payload) -> None:
+    """Best-effort atomic cache write; a per-writer temp file keeps concurrent requests apart."""
+    tmp_path = None
+    try:
+        os.makedirs(BARS_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=BARS_DIR, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+        os.replace(tmp_path, path)
+    except (OSError, ValueError, TypeError):
+        # The bars are already in hand; a failed cache write only costs the next request a pull
+        if tmp_path:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+
+def resample_bars(df: pd.DataFrame, interval: str) -> pd.DataFrame:
+    """Aggregate base bars to `interval` (OHLC first/max/min/last, volume summed) in ET."""
+    _, rule, kwargs = RESAMPLE[interval]
+    if rule is None or df.empty:
+        return df
+    if rule.endswith("min") or rule.endswith("h"):
+        # Intraday bins never span sessions: resample each ET day separately
+        parts = [g.resample(rule, **kwargs).agg(OHLCV) for _, g in df.groupby(df.index.date)]
+        out = pd.concat(parts) if parts else df.iloc[0:0]
+    else:
+        out = df.resample(rule, **kwargs).agg(OHLCV)
+    return out.dropna(subset=["Open"])
+
+
+def bin_start(ts: pd.Timestamp, interval: str) -> pd.Timestamp:
+    """Start of the `interval` bin containing `ts`, matching resample_bars' bin edges."""
+    _, rule, kwargs = RESAMPLE[interval]
+    if rule is None:
+        return ts
+    if rule == "W-MON":
+        return ts.normalize() - pd.Timedelta(days=ts.weekday())
+    if rule == "MS":
+        return ts.normalize().replace(day=1)
+    offset = pd.Timedelta(kwargs.get("offset", 0))
+    return (ts - offset).floor(rule) + offset
+
+
+def get_bars(symbol: str, days: int = 60, interval: str = "") -> pd.DataFrame:
+    """Bars for the last `days` at `interval`, cut from the shared base series."""
+    interval = INTERVAL_ALIASES.get(interval, interval)
+    if interval not in RESAMPLE:
+        interval = default_interval(days)
+    base = RESAMPLE[interval][0]
+
+    df = load_base(symbol, base, days)
+    if df.empty and base != "1d":
+        # Fallbacks: no intraday data (e.g. delisted / thin names) -> daily bars
+        base, interval = "1d", "1d"
+        df = load_base(symbol, base, max(days, 90))
+    if df.empty:
+        return df
+
+    if days <= 1 and base == "5m":
+        # Latest session only, regular trading hours (9:30 AM - 4:00 PM ET)
+        last_day = df.index[-1].date()
+        df = df[df.index.date == last_day]
+        minutes = df.index.hour * 60 + df.index.minute
+        df = df[(minutes >= 570) & (minutes <= 960)]
+    else:
+        cutoff = df.index[-1] - pd.Timedelta(days=min(days, 365))
+        start = bin_start(cutoff, interval)
+        # Widen the range back to a bin edge so the first aggregated bar is a whole one
+        df = df[df.index > cutoff] if start == cutoff else df[df.index >= start]
+    return resample_bars(df, interval)
+
+
+def bars_to_json(df: pd.DataFrame):
+    out = []
+    for ts, row in zip(_epoch_ms(df.index), df.itertuples(index=False)):
+        out.append({
+            "timestamp": int(ts),
+            "open": float(row.Open),
+            "high": float(row.High),
+            "low": float(row.Low),
+            "close": float(row.Close),
+            "volume": int(row.Volume),
+        })
+    return out  # ascending for chart
+
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
@@ -9,68 +203,10 @@ if __name__ == "__main__":
         sys.exit(0)
     symbol = sys.argv[1]
     days = int(sys.argv[2]) if len(sys.argv) > 2 else 60
+    interval = sys.argv[3].lower() if len(sys.argv) > 3 else ""
     try:
-        t = yf.Ticker(symbol)
-        # Choose interval/period based on requested days
-        if days <= 1:
-            period = "1d"
-            interval = "5m"  # Use 5m for better intraday resolution
-        elif days <= 7:
-            period = "7d"
-            interval = "60m"
-        elif days <= 30:
-            period = f"{days}d"
-            interval = "1d"
-        else:
-            period = f"{min(days, 365)}d"
-            interval = "1d"
-
-        # Use prepost=True to include pre/post market data for better coverage
-        df = t.history(period=period, interval=interval, auto_adjust=True, prepost=True)
-        if df is None or df.empty:
-            # Fallbacks
-            if interval != "1d":
-                df = t.history(period="7d", interval="60m", auto_adjust=True, prepost=True)
-            if df is None or df.empty:
-                df = t.history(period="3mo", interval="1d", auto_adjust=True, prepost=True)
-        out = []
-        reset_df = df.reset_index()
-        for idx, row in reset_df.iterrows():
-            # Index label may be 'Datetime' (intraday) or 'Date' (daily)
-            key = 'Datetime' if 'Datetime' in reset_df.columns else 'Date'
-            try:
-                dt = row[key].to_pydatetime()
-                ts = int(dt.timestamp() * 1000)
-                
-                # For 1-day data, filter to regular trading hours (9:30 AM - 4:00 PM ET)
-                if days <= 1 and 'Datetime' in reset_df.columns:
-                    # Convert to ET timezone for trading hours check
-                    import pytz
-                    et = pytz.timezone('US/Eastern')
-                    dt_et = dt.astimezone(et)
-                    hour = dt_et.hour
-                    minute = dt_et.minute
-                    time_minutes = hour * 60 + minute
-                    
-                    # Trading hours: 9:30 AM (570 minutes) to 4:00 PM (960 minutes)
-                    if time_minutes < 570 or time_minutes > 960:
-                        continue
-                        
-            except Exception:
-                ts = int(idx)
-            out.append({
-                "timestamp": ts,
-                "open": float(row.get('Open', 0.0)),
-                "high": float(row.get('High', 0.0)),
-                "low": float(row.get('Low', 0.0)),
-                "close": float(row.get('Close', 0.0)),
-                "volume": int(row.get('Volume', 0)),
-            })
-        out.sort(key=lambda x: x["timestamp"])  # ensure ascending for chart
-        print(json.dumps(out))
+        print(json.dumps(bars_to_json(get_bars(symbol, days, interval))))
         sys.exit(0)
     except Exception as e:
         print(json.dumps({"error": str(e)}))
         sys.exit(1)
-
-
@@ -1,79 +1,347 @@
 #!/usr/bin/env python
 import sys
+import os
 import json
 import yfinance as yf
 import time
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+# Fields compared between ticks in --stream mode; updatedAt only rides along with a change.
+# `history` is not diffed: clients draw the sparkline's last point from `price`, and the
+# closes are re-sent only when a new session's daily bar shows up.
+STREAM_FIELDS = ["price", "change", "changePercent", "prevClose", "error"]
+HISTORY_TTL = 1800           # seconds between sparkline refetches while streaming
+
+# ---- Screener ----
+SCREEN_CHUNK = 200           # symbols per bulk download
+SCREEN_LOOKBACK = 252        # trading days in the 52-week high/low window
+VOLUME_AVG_DAYS = 20
+SCREEN_SORT_KEYS = ["changePercent", "volumeSpike", "fromHigh", "fromLow"]
+
+def fetch_history(t):
+    """Last month of daily closes for the sparkline and the date of its last bar (None if empty)."""
+    hist = t.history(period="1mo", interval="1d", auto_adjust=True, prepost=True)
+    if hist is None or hist.empty:
+        return None, []
+    return str(hist.index[-1].date()), [float(c) for c in hist['Close'].tolist()[-30:]]
+
+def fetch_quote(sym, closes=None):
+    """Quote for one symbol; pass `closes` to reuse an already fetched sparkline history."""
+    try:
+        t = yf.Ticker(sym)
+        
+        # Get live quote data with multiple fallbacks
+        info = t.fast_info if hasattr(t, 'fast_info') else {}
+        
+        # Try multiple sources for current price
+        price = 0.0
+        if info.get('last_price'):
+            price = float(info.get('last_price'))
+        elif info.get('lastPrice'):
+            price = float(info.get('lastPrice'))
+        else:
+            # Fallback: get latest from today's intraday data
+            try:
+                hist = t.history(period="1d", interval="1m", prepost=True, auto_adjust=True)
+                if hist is not None and not hist.empty:
+                    price = float(hist['Close'].iloc[-1])
+            except:
+                pass
+        
+        # Get previous close
+        previous_close = 0.0
+        if info.get('previous_close'):
+            previous_close = float(info.get('previous_close'))
+        elif info.get('previousClose'):
+            previous_close = float(info.get('previousClose'))
+        else:
+            # Fallback: get from yesterday's data
+            try:
+                hist = t.history(period="2d", interval="1d", auto_adjust=True)
+                if hist is not None and not hist.empty and len(hist) >= 2:
+                    previous_close = float(hist['Close'].iloc[-2])  # Second to last day
+            except:
+                pass
+        
+        change = price - previous_close if previous_close else 0.0
+        change_percent = (change / previous_close * 100.0) if previous_close else 0.0
+        
+        # 1 month daily closes for sparkline (include today)
+        if closes is None:
+            _, closes = fetch_history(t)
+        
+        return {
+            "symbol": sym.upper(),
+            "price": round(price, 2),
+            "change": round(change, 2),
+            "changePercent": round(change_percent, 5),
+            "history": closes,
+            "prevClose": round(previous_close, 2),
+            "updatedAt": int(time.time() * 1000),
+        }
+    except Exception as e:
+        return {
+            "symbol": sym.upper(),
+            "error": str(e),
+            "price": 0,
+            "change": 0,
+            "changePercent": 0,
+            "history": [],
+            "updatedAt": int(time.time() * 1000),
+        }
 
 def fetch_quotes(symbols):
-    data = []
-    for sym in symbols:
+    return [fetch_quote(sym) for sym in symbols]
+
+def diff_quote(prev, cur):
+    """Fields of `cur` that differ from `prev`, keyed by symbol; None when nothing moved."""
+    changed = {f: cur.get(f) for f in STREAM_FIELDS if prev.get(f) != cur.get(f)}
+    if not changed:
+        return None
+    changed["symbol"] = cur["symbol"]
+    changed["updatedAt"] = cur["updatedAt"]
+    return changed
+
+def _read_commands(commands):
+    """stdin carries one JSON command per line: {"subscribe": [...]} / {"unsubscribe": [...]}."""
+    for line in sys.stdin:
         try:
-            t = yf.Ticker(sym)
-            
-            # Get live quote data with multiple fallbacks
-            info = t.fast_info if hasattr(t, 'fast_info') else {}
-            
-            # Try multiple sources for current price
-            price = 0.0
-            if info.get('last_price'):
-                price = float(info.get('last_price'))
-            elif info.get('lastPrice'):
-                price = float(info.get('lastPrice'))
-            else:
-                # Fallback: get latest from today's intraday data
-                try:
-                    hist = t.history(period="1d", interval="1m", prepost=True, auto_adjust=True)
-                    if hist is not None and not hist.empty:
-                        price = float(hist['Close'].iloc[-1])
-                except:
-                    pass
-            
-            # Get previous close
-            previous_close = 0.0
-            if info.get('previous_close'):
-                previous_close = float(info.get('previous_close'))
-            elif info.get('previousClose'):
-                previous_close = float(info.get('previousClose'))
-            else:
-                # Fallback: get from yesterday's data
+            commands.put(json.loads(line))
+        except ValueError:
+            continue
+    commands.put(None)  # parent went away
+
+def _emit(event):
+    sys.stdout.write(json.dumps(event) + "\n")
+    sys.stdout.flush()
+
+def stream_quotes(symbols, interval=15.0):
+    """Poll the union of subscribed symbols and write one snapshot, then compact deltas.
+
+    Each stdout line is a JSON event ready to relay as an SSE `data:` payload:
+    {"type": "snapshot", "seq": 0, "data": [quote, ...]}
+    {"type": "delta", "seq": n, "data": [{"symbol", <changed fields>, "updatedAt"}], "removed": [...]}
+    Ticks where nothing changed produce no output. Deltas never repeat the sparkline; a
+    symbol's full `history` rides along only when a new session's daily bar appears.
+    """
+    refs = {}
+    for sym in symbols:
+        refs[sym.upper()] = refs.get(sym.upper(), 0) + 1
+    last = {}
+    closes = {}  # symbol -> (fetched at, last bar date, sparkline closes); refetched every HISTORY_TTL
+    seq = 0
+    commands = queue.Queue()
+    threading.Thread(target=_read_commands, args=(commands,), daemon=True).start()
+
+    while True:
+        deadline = time.time() + interval
+        removed = []
+        while True:
+            try:
+                cmd = commands.get(timeout=max(0.0, deadline - time.time()) if seq else 0)
+            except queue.Empty:
+                break
+            if cmd is None:
+                return
+            for sym in cmd.get("subscribe", []):
+                refs[sym.upper()] = refs.get(sym.upper(), 0) + 1
+            for sym in cmd.get("unsubscribe", []):
+                sym = sym.upper()
+                if sym in refs:
+                    refs[sym] -= 1
+                    if refs[sym] <= 0:
+                        del refs[sym]
+                        last.pop(sym, None)
+                        closes.pop(sym, None)
+                        removed.append(sym)
+
+        changes = []
+        for sym in sorted(refs):
+            now = time.time()
+            cached = closes.get(sym)
+            new_bar = False
+            if cached is None or now - cached[0] >= HISTORY_TTL:
                 try:
-                    hist = t.history(period="2d", interval="1d", auto_adjust=True)
-                    if hist is not None and not hist.empty and len(hist) >= 2:
-                        previous_close = float(hist['Close'].iloc[-2])  # Second to last day
-                except:
-                    pass
-            
-            change = price - previous_close if previous_close else 0.0
-            change_percent = (change / previous_close * 100.0) if previous_close else 0.0
-            
-            # 1 month daily closes for sparkline (include today)
-            hist = t.history(period="1mo", interval="1d", auto_adjust=True, prepost=True)
-            closes = []
-            if hist is not None and not hist.empty:
-                closes = [float(c) for c in hist['Close'].tolist()[-30:]]
-            
-            data.append({
-                "symbol": sym.upper(),
-                "price": round(price, 2),
-                "change": round(change, 2),
-                "changePercent": round(change_percent, 5),
-                "history": closes,
-                "prevClose": round(previous_close, 2),
-                "updatedAt": int(time.time() * 1000),
-            })
-        except Exception as e:
-            data.append({
-                "symbol": sym.upper(),
-                "error": str(e),
-                "price": 0,
-                "change": 0,
-                "changePercent": 0,
-                "history": [],
-                "updatedAt": int(time.time() * 1000),
-            })
-    return data
+                    bar, hist = fetch_history(yf.Ticker(sym))
+                except Exception:
+                    bar, hist = None, []
+                if hist:
+                    # A history fetched before today's bar existed (e.g. across midnight) gets
+                    # replaced wholesale once the new bar appears, never patched in place
+                    new_bar = cached is not None and bar != cached[1]
+                    closes[sym] = (now, bar, hist)
+            q = fetch_quote(sym, closes[sym][2] if sym in closes else None)
+            prev = last.get(sym)
+            last[sym] = q
+            if prev is None:
+                changes.append(q)
+                continue
+            d = diff_quote(prev, q)
+            if new_bar and "error" not in q:
+                d = d or {"symbol": q["symbol"], "updatedAt": q["updatedAt"]}
+                d["history"] = q["history"]
+            if d:
+                changes.append(d)
+
+        if seq == 0:
+            _emit({"type": "snapshot", "seq": seq, "data": [last[s] for s in sorted(last)]})
+            seq += 1
+        elif changes or removed:
+            _emit({"type": "delta", "seq": seq, "data": changes, "removed": removed})
+            seq += 1
+
+def load_chunk(symbols, fixture=None):
+    """Daily close/high/low/volume as (days, symbols) float arrays for one chunk.
+
+    `fixture` is a directory of close/high/low/volume .npy arrays plus symbols.txt (see
+    bench_screener.py); the arrays are memory-mapped so only the requested columns are read.
+    """
+    if fixture:
+        with open(os.path.join(fixture, "symbols.txt"), "r", encoding="utf-8") as f:
+            index = {line.strip(): i for i, line in enumerate(f)}
+        found = [s for s in symbols if s in index]
+        cols = [index[s] for s in found]
+        return found, {
+            k: np.asarray(np.load(os.path.join(fixture, f"{k}.npy"), mmap_mode="r")[:, cols], dtype=np.float64)
+            for k in ("close", "high", "low", "volume")
+        }
+
+    df = yf.download(symbols, period="1y", interval="1d", auto_adjust=True,
+                     group_by="column", threads=True, progress=False)
+    if df is None or df.empty:
+        return [], {}
+    found = [s for s in symbols if s in df["Close"].columns]
+    return found, {
+        k.lower(): df[k][found].to_numpy(dtype=np.float64)
+        for k in ("Close", "High", "Low", "Volume")
+    }
+
+def screen_metrics(close, high, low, volume):
+    """Vectorized per-symbol screen over (days, symbols) arrays; NaNs mark missing bars."""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        last = close[-1]
+        prev = close[-2]
+        change_pct = (last - prev) / prev * 100.0
+        avg_vol = np.nanmean(volume[-VOLUME_AVG_DAYS - 1:-1], axis=0)
+        vol_spike = volume[-1] / avg_vol
+        hi = np.nanmax(high[-SCREEN_LOOKBACK:], axis=0)
+        lo = np.nanmin(low[-SCREEN_LOOKBACK:], axis=0)
+        from_high = (last / hi - 1.0) * 100.0
+        from_low = (last / lo - 1.0) * 100.0
+    return {
+        "price": last,
+        "changePercent": change_pct,
+        "volumeSpike": vol_spike,
+        "fromHigh": from_high,
+        "fromLow": from_low,
+    }
+
+def _top_rows(symbols, metrics, sort_key, top, absolute):
+    score = metrics[sort_key]
+    score = np.abs(score) if absolute else score
+    score = np.where(np.isfinite(score), score, -np.inf)
+    k = min(top, len(symbols))
+    if k == 0:
+        return []
+    idx = np.argpartition(-score, k - 1)[:k]
+    idx = idx[np.isfinite(score[idx])]
+    rows = []
+    for i in idx:
+        row = {"symbol": symbols[i]}
+        for name, values in metrics.items():
+            v = float(values[i])
+            row[name] = round(v, 4) if np.isfinite(v) else None
+        rows.append(row)
+    return rows
+
+def screen_chunk(symbols, sort_key="changePercent", top=25, absolute=True, fixture=None):
+    """Download, score and reduce one chunk to its local top-N; the bars are dropped on return."""
+    try:
+        found, bars = load_chunk(symbols, fixture)
+    except Exception as e:
+        print(f"Screen chunk failed ({symbols[0]}..{symbols[-1]}): {e}", file=sys.stderr)
+        return []
+    if not found or bars["close"].shape[0] < 2:
+        return []
+    metrics = screen_metrics(bars["close"], bars["high"], bars["low"], bars["volume"])
+    return _top_rows(found, metrics, sort_key, top, absolute)
+
+def _unique_symbols(symbols):
+    return list(dict.fromkeys(s.strip().upper() for s in symbols if s.strip()))
+
+def screen_universe(symbols, sort_key="changePercent", top=25, chunk=SCREEN_CHUNK,
+                    workers=0, absolute=True, fixture=None):
+    """Rank a large universe chunk by chunk, keeping at most `top` rows per chunk in memory."""
+    if sort_key not in SCREEN_SORT_KEYS:
+        raise ValueError(f"sort must be one of {', '.join(SCREEN_SORT_KEYS)}")
+    symbols = _unique_symbols(symbols)
+    chunks = [symbols[i:i + chunk] for i in range(0, len(symbols), chunk)]
+    args = (sort_key, top, absolute, fixture)
+
+    best = []
+    if workers and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for rows in pool.map(screen_chunk, chunks, *[[a] * len(chunks) for a in args]):
+                best = _merge_top(best, rows, sort_key, top, absolute)
+    else:
+        for c in chunks:
+            best = _merge_top(best, screen_chunk(c, *args), sort_key, top, absolute)
+    return best
+
+def _merge_top(best, rows, sort_key, top, absolute):
+    key = (lambda r: abs(r[sort_key])) if absolute else (lambda r: r[sort_key])
+    merged = [r for r in best + rows if r.get(sort_key) is not None]
+    merged.sort(key=key, reverse=True)
+    return merged[:top]
+
+def _screen_args(args):
+    """--screen SYMBOLS|@file [--sort key] [--top N] [--chunk K] [--workers W] [--signed] [--fixture path]"""
+    opts = {"sort": "changePercent", "top": "25", "chunk": str(SCREEN_CHUNK), "workers": "0", "fixture": None}
+    symbols = []
+    absolute = True
+    i = 0
+    while i < len(args):
+        a = args[i]
+        if a == "--signed":
+            absolute = False
+        elif a.startswith("--") and a[2:] in opts and i + 1 < len(args):
+            opts[a[2:]] = args[i + 1]
+            i += 1
+        elif a.startswith("@"):
+            with open(a[1:], "r", encoding="utf-8") as f:
+                symbols.extend(line.strip() for line in f if line.strip() and not line.startswith("#"))
+        else:
+            symbols.extend(a.split(","))
+        i += 1
+    return symbols, opts, absolute
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--screen":
+        symbols, opts, absolute = _screen_args(sys.argv[2:])
+        symbols = _unique_symbols(symbols)
+        try:
+            rows = screen_universe(symbols, opts["sort"], int(opts["top"]), int(opts["chunk"]),
+                                   int(opts["workers"]), absolute, opts["fixture"])
+        except Exception as e:
+            print(json.dumps({"error": str(e)}))
+            sys.exit(1)
+        print(json.dumps({"data": rows, "universe": len(symbols), "updatedAt": int(time.time() * 1000)}))
+        sys.exit(0)
+    if len(sys.argv) > 1 and sys.argv[1] == "--stream":
+        # --stream [interval_seconds] [symbol ...]; further symbols arrive over stdin
+        args = sys.argv[2:]
+        interval = 15.0
+        if args:
+            try:
+                interval = float(args[0])
+                args = args[1:]
+            except ValueError:
+                pass
+        stream_quotes(args, interval)
+        sys.exit(0)
     symbols = sys.argv[1:]
     if not symbols:
         print(json.dumps([]))
@@ -0,0 +1,59 @@
+/* eslint-disable @typescript-eslint/no-explicit-any */
+import { NextResponse } from "next/server";
+import { spawn } from "node:child_process";
+import { z } from "zod";
+
+const QuerySchema = z.object({
+  symbols: z.string().transform((s) => [...new Set(s.split(",").map((s) => s.trim().toUpperCase()).filter(Boolean))]),
+  window: z.coerce.number().int().min(5).max(252).default(60),
+  days: z.coerce.number().int().min(30).max(365).default(365),
+});
+
+async function trySpawn(cmd: string, args: string[], cwd: string) {
+  return await new Promise<{ ok: boolean; out: string; err: string; code: number }>((resolve) => {
+    const p = spawn(cmd, args, { cwd });
+    let out = "";
+    let err = "";
+    p.stdout.on("data", (d: any) => (out += d.toString()));
+    p.stderr.on("data", (d: any) => (err += d.toString()));
+    p.on("close", (code: any) => resolve({ ok: code === 0, out, err, code: code ?? -1 }));
+    p.on("error", (e: any) => resolve({ ok: false, out: "", err: String(e), code: -1 }));
+  });
+}
+
+export async function GET(req: Request) {
+  const url = new URL(req.url);
+  const parsed = QuerySchema.safeParse(Object.fromEntries(url.searchParams));
+  if (!parsed.success || !parsed.data.symbols.length) {
+    return NextResponse.json({ error: "symbols required" }, { status: 400 });
+  }
+  const { symbols, window, days } = parsed.data;
+
+  const cwd = process.cwd();
+  const candidates: Array<{ cmd: string; extraArgs: string[] }> = (
+    [
+      process.env.PYTHON_PATH ? { cmd: process.env.PYTHON_PATH, extraArgs: [] } : undefined,
+      process.platform === 'win32' ? { cmd: 'py', extraArgs: ['-3'] } : undefined,
+      process.platform === 'win32' ? { cmd: 'py', extraArgs: [] } : undefined,
+      { cmd: 'python3', extraArgs: [] },
+      { cmd: 'python', extraArgs: [] },
+    ].filter(Boolean) as Array<{ cmd: string; extraArgs: string[] }>
+  );
+
+  let lastErr = "";
+  for (const c of candidates) {
+    const run = await trySpawn(c.cmd, [...c.extraArgs, "scripts/yfinance_correlation.py", symbols.join(","), String(window), String(days)], cwd);
+    if (run.ok) {
+      try {
+        const data = JSON.parse(run.out);
+        return NextResponse.json({ data, updatedAt: Date.now() });
+      } catch {
+        lastErr = `Invalid JSON from yfinance correlation (${c.cmd}). stdout: ${run.out?.slice(0, 2000)}`;
+        break;
+      }
+    }
+    lastErr = `${c.cmd} failed (code ${run.code}). stderr: ${run.err?.slice(0, 2000)}`;
+  }
+
+  return NextResponse.json({ error: lastErr || "Failed to execute yfinance" }, { status: 500 });
+}
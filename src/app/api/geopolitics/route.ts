@@ -1,5 +1,6 @@
 import { NextResponse } from "next/server";
 import * as xlsx from "xlsx";
+import { readMacroPulse } from "@/lib/cache";
 
 const GPR_URL = "https://www.matteoiacoviello.com/gpr_files/data_gpr_export.xls";
 const HOURS = 3600 * 1000;
@@ -163,6 +164,22 @@ export async function GET() {
     if (_cache && Date.now() - _cache.t < 24 * HOURS) {
       return NextResponse.json(_cache.data);
     }
+
+    // Precomputed by scripts/macro_analytics.py (latest vs previous month, z over 60 months);
+    // skips downloading and scanning the workbook
+    const rec = readMacroPulse("gpr");
+    if (rec && rec.value !== null && rec.z !== null) {
+      const result = {
+        key: "geopolitics",
+        label: labelFromZ(rec.z),
+        deltaPct: Math.round(rec.deltaPct),
+        value: Math.round(rec.value),
+        timePeriod: "monthly",
+        asOf: rec.asOf.slice(0, 7)
+      };
+      _cache = { t: Date.now(), data: { items: [result], asOf: new Date().toISOString() } };
+      return NextResponse.json(_cache.data);
+    }
     
     // Try to fetch real GPR data, fallback to static data if it fails
     // This will provide real geopolitical risk indicators instead of static 0% values
@@ -44,8 +44,10 @@ export async function GET(req: Request) {
     }
   }
 
-  // Map range->days for our Python script
-  const days = range === "1d" ? 1 : range === "1w" ? 7 : range === "1mo" ? 30 : 365;
+  // Map range->days for our Python script ("7d", "30d", "365d" as well as 1d/1w/1mo/1y)
+  const m = /^(\d+)(d|w|wk|mo|y)$/.exec(range);
+  const unitDays: Record<string, number> = { d: 1, w: 7, wk: 7, mo: 30, y: 365 };
+  const days = m ? Math.min(parseInt(m[1]) * unitDays[m[2]], 365) : 365;
 
   const cwd = process.cwd();
   const candidates: Array<{ cmd: string; extraArgs: string[] }> = (
@@ -60,7 +62,7 @@ export async function GET(req: Request) {
 
   let lastErr = "";
   for (const c of candidates) {
-    const run = await trySpawn(c.cmd, [...c.extraArgs, "scripts/yfinance_history.py", ticker, String(days)], cwd);
+    const run = await trySpawn(c.cmd, [...c.extraArgs, "scripts/yfinance_history.py", ticker, String(days), interval], cwd);
     if (run.ok) {
       try {
         const arr = JSON.parse(run.out);
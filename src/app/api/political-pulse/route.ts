@@ -1,4 +1,5 @@
 import { NextResponse } from "next/server";
+import { readMacroPulse } from "@/lib/cache";
 
 const FRED_KEY = process.env.FRED_KEY; // required for FRED
 const HOURS = 3600 * 1000;
@@ -76,20 +77,33 @@ export async function GET() {
       return NextResponse.json({ items: _cache.data, asOf: new Date().toISOString() });
     }
 
-    // 1) Policy Uncertainty (EPU index) - Use 3-month comparison instead of 1-month
-    const epu = await fredSeries("USEPUINDXD");
-    const epu5y = epu.slice(-60); // monthly series, ~5y
-    const epuLatest = epu5y.at(-1) ?? 0;
-    // Compare to 3 months ago for more meaningful change
-    const epuPrev = epu5y.at(-4) ?? epu5y.at(-2) ?? epuLatest;
-    const epuZ = zScore(epuLatest, epu5y);
-    const policy: PulseItem = {
-      key: "policy",
-      label: labelFromZ(epuZ),
-      deltaPct: Math.round(pct(epuLatest, epuPrev)),
-      value: Number(epuLatest.toFixed(0)),
-      timePeriod: "monthly"
-    };
+    // 1) Policy Uncertainty (EPU index) - Use 3-month comparison instead of 1-month.
+    // Precomputed by scripts/macro_analytics.py when fresh; FRED otherwise
+    let policy: PulseItem;
+    const epuRec = readMacroPulse("epu");
+    if (epuRec && epuRec.value !== null && epuRec.z !== null) {
+      policy = {
+        key: "policy",
+        label: labelFromZ(epuRec.z),
+        deltaPct: Math.round(epuRec.deltaPct),
+        value: Number(epuRec.value.toFixed(0)),
+        timePeriod: "monthly"
+      };
+    } else {
+      const epu = await fredSeries("USEPUINDXD");
+      const epu5y = epu.slice(-60); // monthly series, ~5y
+      const epuLatest = epu5y.at(-1) ?? 0;
+      // Compare to 3 months ago for more meaningful change
+      const epuPrev = epu5y.at(-4) ?? epu5y.at(-2) ?? epuLatest;
+      const epuZ = zScore(epuLatest, epu5y);
+      policy = {
+        key: "policy",
+        label: labelFromZ(epuZ),
+        deltaPct: Math.round(pct(epuLatest, epuPrev)),
+        value: Number(epuLatest.toFixed(0)),
+        timePeriod: "monthly"
+      };
+    }
 
     // 2) Regulatory Risk (Rules + Proposed in last 30 days vs prior 30)
     const now = new Date();
@@ -128,61 +142,73 @@ export async function GET() {
     // Election Impact removed - replaced with Geopolitics
 
     // 4) Trade Relations (Trade Policy Uncertainty from FRED)
-    let tpuLatest = 150; // Default fallback values
-    let tpuPrev = 145;
-    let tpu5yVals: number[] = [120, 125, 130, 128, 135, 140, 138, 142, 145, 148, 150, 155, 152, 158, 160, 162, 165, 168, 170, 172, 175, 178, 180, 182, 185, 188, 190, 192, 195, 198, 200, 202, 205, 208, 210, 212, 215, 218, 220, 222, 225, 228, 230, 232, 235, 238, 240, 242, 245, 248, 250, 252, 255, 258, 260, 262, 265, 268, 270, 272];
+    let trade: PulseItem;
+    const tradeRec = readMacroPulse("eputrade");
+    if (tradeRec && tradeRec.value !== null && tradeRec.z !== null) {
+      trade = {
+        key: "trade",
+        label: labelFromZ(tradeRec.z),
+        deltaPct: Math.round(tradeRec.deltaPct),
+        value: Number(tradeRec.value.toFixed(0)),
+        timePeriod: "monthly"
+      };
+    } else {
+      let tpuLatest = 150; // Default fallback values
+      let tpuPrev = 145;
+      let tpu5yVals: number[] = [120, 125, 130, 128, 135, 140, 138, 142, 145, 148, 150, 155, 152, 158, 160, 162, 165, 168, 170, 172, 175, 178, 180, 182, 185, 188, 190, 192, 195, 198, 200, 202, 205, 208, 210, 212, 215, 218, 220, 222, 225, 228, 230, 232, 235, 238, 240, 242, 245, 248, 250, 252, 255, 258, 260, 262, 265, 268, 270, 272];
     
-    try {
-      const response = await fetch("https://fred.stlouisfed.org/graph/fredgraph.csv?id=EPUTRADE");
-      const csvText = await response.text();
+      try {
+        const response = await fetch("https://fred.stlouisfed.org/graph/fredgraph.csv?id=EPUTRADE");
+        const csvText = await response.text();
       
-      const lines = csvText.trim().split("\n");
+        const lines = csvText.trim().split("\n");
       
-      // Parse headers and find EPUTRADE column
-      const headers = lines[0].split(',');
-      const tpuIndex = headers.findIndex(h => /EPUTRADE/i.test(h));
+        // Parse headers and find EPUTRADE column
+        const headers = lines[0].split(',');
+        const tpuIndex = headers.findIndex(h => /EPUTRADE/i.test(h));
       
-      if (tpuIndex !== -1 && lines.length > 1) {
-        // Parse data rows
-        const tradeData: { date: string; value: number }[] = [];
-        for (let i = 1; i < lines.length; i++) {
-          const row = lines[i].split(',');
-          const dateStr = row[0]?.trim();
-          const value = parseFloat(row[tpuIndex]?.trim() || '');
+        if (tpuIndex !== -1 && lines.length > 1) {
+          // Parse data rows
+          const tradeData: { date: string; value: number }[] = [];
+          for (let i = 1; i < lines.length; i++) {
+            const row = lines[i].split(',');
+            const dateStr = row[0]?.trim();
+            const value = parseFloat(row[tpuIndex]?.trim() || '');
           
-          if (dateStr && !isNaN(value)) {
-            tradeData.push({ date: dateStr, value });
+            if (dateStr && !isNaN(value)) {
+              tradeData.push({ date: dateStr, value });
+            }
           }
-        }
         
-        if (tradeData.length >= 2) {
-          // Get latest and previous values
-          const latest = tradeData[tradeData.length - 1];
-          const previous = tradeData[tradeData.length - 2];
-          tpuLatest = latest.value;
-          tpuPrev = previous.value;
+          if (tradeData.length >= 2) {
+            // Get latest and previous values
+            const latest = tradeData[tradeData.length - 1];
+            const previous = tradeData[tradeData.length - 2];
+            tpuLatest = latest.value;
+            tpuPrev = previous.value;
           
-          // Get last 60 months for z-score
-          const values = tradeData.map(d => d.value);
-          tpu5yVals = values.slice(-60);
+            // Get last 60 months for z-score
+            const values = tradeData.map(d => d.value);
+            tpu5yVals = values.slice(-60);
+          }
         }
+      } catch {
+        console.warn('Trade Policy Uncertainty FRED data error, using fallback');
+        // Use more realistic fallback values
+        tpuLatest = 150;
+        tpuPrev = 145;
+        tpu5yVals = [120, 125, 130, 128, 135, 140, 138, 142, 145, 148, 150, 155, 152, 158, 160, 162, 165, 168, 170, 172, 175, 178, 180, 182, 185, 188, 190, 192, 195, 198, 200, 202, 205, 208, 210, 212, 215, 218, 220, 222, 225, 228, 230, 232, 235, 238, 240, 242, 245, 248, 250, 252, 255, 258, 260, 262, 265, 268, 270, 272];
       }
-    } catch {
-      console.warn('Trade Policy Uncertainty FRED data error, using fallback');
-      // Use more realistic fallback values
-      tpuLatest = 150;
-      tpuPrev = 145;
-      tpu5yVals = [120, 125, 130, 128, 135, 140, 138, 142, 145, 148, 150, 155, 152, 158, 160, 162, 165, 168, 170, 172, 175, 178, 180, 182, 185, 188, 190, 192, 195, 198, 200, 202, 205, 208, 210, 212, 215, 218, 220, 222, 225, 228, 230, 232, 235, 238, 240, 242, 245, 248, 250, 252, 255, 258, 260, 262, 265, 268, 270, 272];
-    }
     
-    const tpuZ = zScore(tpuLatest, tpu5yVals);
-    const trade: PulseItem = {
-      key: "trade",
-      label: labelFromZ(tpuZ),
-      deltaPct: Math.round(pct(tpuLatest, tpuPrev)),
-      value: Number(tpuLatest.toFixed(0)),
-      timePeriod: "monthly"
-    };
+      const tpuZ = zScore(tpuLatest, tpu5yVals);
+      trade = {
+        key: "trade",
+        label: labelFromZ(tpuZ),
+        deltaPct: Math.round(pct(tpuLatest, tpuPrev)),
+        value: Number(tpuLatest.toFixed(0)),
+        timePeriod: "monthly"
+      };
+    }
 
     const items = [policy, regulatory, trade];
     _cache = { t: Date.now(), data: items };
@@ -0,0 +1,174 @@
+/* eslint-disable @typescript-eslint/no-explicit-any */
+import { spawn, type ChildProcessWithoutNullStreams } from "node:child_process";
+import { z } from "zod";
+
+export const dynamic = "force-dynamic";
+
+const QuerySchema = z.object({
+  symbols: z.string().transform((s) => [...new Set(s.split(",").map((s) => s.trim().toUpperCase()).filter(Boolean))]),
+});
+
+type StreamEvent = { type: "snapshot" | "delta"; seq: number; data: Array<Record<string, any>>; removed?: string[] };
+type Listener = { symbols: Set<string>; send: (event: StreamEvent) => void };
+
+// One shared `yfinance_quotes.py --stream` poller for every connected client. It tracks the
+// union of subscribed symbols; we keep the merged latest state so late joiners get a snapshot.
+const POLL_SECONDS = 15;
+const RESTART_DELAY_MS = 2000;
+const listeners = new Set<Listener>();
+const state = new Map<string, Record<string, any>>();
+let poller: ChildProcessWithoutNullStreams | null = null;
+
+function candidates() {
+  return (
+    [
+      process.env.PYTHON_PATH ? { cmd: process.env.PYTHON_PATH, extraArgs: [] } : undefined,
+      process.platform === 'win32' ? { cmd: 'py', extraArgs: ['-3'] } : undefined,
+      process.platform === 'win32' ? { cmd: 'py', extraArgs: [] } : undefined,
+      { cmd: 'python3', extraArgs: [] },
+      { cmd: 'python', extraArgs: [] },
+    ].filter(Boolean) as Array<{ cmd: string; extraArgs: string[] }>
+  );
+}
+
+function applyEvent(event: StreamEvent) {
+  for (const sym of event.removed ?? []) state.delete(sym);
+  for (const q of event.data) {
+    state.set(q.symbol, event.type === "snapshot" ? q : { ...(state.get(q.symbol) ?? {}), ...q });
+  }
+  for (const l of listeners) {
+    const data = event.data.filter((q) => l.symbols.has(q.symbol));
+    if (data.length) l.send({ ...event, data, removed: undefined });
+  }
+}
+
+// Every listener's symbols, repeats included: the poller reference-counts its argv the same
+// way as later subscribe/unsubscribe commands
+function subscribedSymbols() {
+  return [...listeners].flatMap((l) => [...l.symbols]);
+}
+
+function startPoller(symbols: string[], attempt = 0) {
+  const list = candidates();
+  const c = list[attempt];
+  if (!c) return;
+  const p = spawn(c.cmd, [...c.extraArgs, "scripts/yfinance_quotes.py", "--stream", String(POLL_SECONDS), ...symbols], { cwd: process.cwd() });
+  poller = p;
+  let spawned = false;
+  let buf = "";
+  p.on("spawn", () => (spawned = true));
+  // EPIPE etc. once the child is gone; the close handler below takes care of restarting
+  p.stdin.on("error", () => {});
+  p.stdout.on("data", (d: any) => {
+    buf += d.toString();
+    let nl: number;
+    while ((nl = buf.indexOf("\n")) !== -1) {
+      const line = buf.slice(0, nl).trim();
+      buf = buf.slice(nl + 1);
+      if (!line) continue;
+      try {
+        applyEvent(JSON.parse(line) as StreamEvent);
+      } catch {
+        // ignore partial / non-JSON output
+      }
+    }
+  });
+  p.on("error", () => {
+    if (poller !== p || spawned) return;
+    // This interpreter is missing; try the next candidate
+    poller = null;
+    startPoller(subscribedSymbols(), attempt + 1);
+  });
+  p.on("close", () => {
+    // A replaced or deliberately stopped poller must not touch the current one's state
+    if (poller !== p || !spawned) return;
+    poller = null;
+    state.clear();
+    // Died with clients still attached: restart with everything they are subscribed to
+    setTimeout(() => {
+      if (!poller && listeners.size) startPoller(subscribedSymbols(), attempt);
+    }, RESTART_DELAY_MS);
+  });
+}
+
+function command(cmd: Record<string, string[]>) {
+  if (!poller || !poller.stdin.writable) return;
+  try {
+    poller.stdin.write(JSON.stringify(cmd) + "\n");
+  } catch {
+    // child went away; its close handler restarts it
+  }
+}
+
+function subscribe(symbols: string[]) {
+  if (!poller) startPoller(subscribedSymbols());
+  else command({ subscribe: symbols });
+}
+
+function unsubscribe(symbols: string[]) {
+  if (!poller) return;
+  if (listeners.size === 0) {
+    poller.stdin.end();
+    poller = null;
+    state.clear();
+    return;
+  }
+  command({ unsubscribe: symbols });
+}
+
+export async function GET(req: Request) {
+  const url = new URL(req.url);
+  const { symbols } = QuerySchema.parse(Object.fromEntries(url.searchParams));
+
+  if (!symbols.length) {
+    return new Response(JSON.stringify({ error: "symbols required" }), { status: 400, headers: { "Content-Type": "application/json" } });
+  }
+
+  const encoder = new TextEncoder();
+  let listener: Listener | null = null;
+  const close = () => {
+    if (!listener) return;
+    listeners.delete(listener);
+    listener = null;
+    unsubscribe(symbols);
+  };
+
+  const stream = new ReadableStream<Uint8Array>({
+    start(controller) {
+      const send = (event: StreamEvent) => {
+        try {
+          controller.enqueue(encoder.encode(`event: ${event.type}\ndata: ${JSON.stringify(event)}\n\n`));
+        } catch {
+          close();
+        }
+      };
+      listener = { symbols: new Set(symbols), send };
+      listeners.add(listener);
+
+      // Late joiner: replay what the shared poller already knows as this client's snapshot
+      const known = symbols.map((s) => state.get(s)).filter(Boolean) as Array<Record<string, any>>;
+      if (known.length) send({ type: "snapshot", seq: 0, data: known });
+      subscribe(symbols);
+
+      req.signal.addEventListener("abort", () => {
+        close();
+        try {
+          controller.close();
+        } catch {
+          // already closed
+        }
+      });
+    },
+    cancel() {
+      close();
+    },
+  });
+
+  return new Response(stream, {
+    headers: {
+      "Content-Type": "text/event-stream",
+      "Cache-Control": "no-cache, no-transform",
+      Connection: "keep-alive",
+    },
+  });
+}
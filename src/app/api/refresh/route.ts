@@ -1,5 +1,46 @@
+/* eslint-disable @typescript-eslint/no-explicit-any */
 import { NextResponse } from "next/server";
 import { revalidatePath } from "next/cache";
+import { spawn } from "node:child_process";
+
+// One background `scripts/macro_analytics.py refresh` at a time; the macro routes pick up
+// tmp/macro_summary.json as soon as it is rewritten. Scheduled runs use `npm run macro:refresh`.
+let _running = false;
+
+async function trySpawnDetached(cmd: string, args: string[], cwd: string) {
+  return await new Promise<boolean>((resolve) => {
+    const p = spawn(cmd, args, { cwd, detached: true, stdio: "ignore" });
+    p.on("spawn", () => {
+      _running = true;
+      p.on("close", () => (_running = false));
+      p.unref();
+      resolve(true);
+    });
+    p.on("error", (e: any) => {
+      console.warn(`macro refresh: ${cmd} failed to start: ${String(e)}`);
+      resolve(false);
+    });
+  });
+}
+
+async function startMacroRefresh() {
+  if (_running) return true;
+  const candidates: Array<{ cmd: string; extraArgs: string[] }> = (
+    [
+      process.env.PYTHON_PATH ? { cmd: process.env.PYTHON_PATH, extraArgs: [] } : undefined,
+      process.platform === 'win32' ? { cmd: 'py', extraArgs: ['-3'] } : undefined,
+      process.platform === 'win32' ? { cmd: 'py', extraArgs: [] } : undefined,
+      { cmd: 'python3', extraArgs: [] },
+      { cmd: 'python', extraArgs: [] },
+    ].filter(Boolean) as Array<{ cmd: string; extraArgs: string[] }>
+  );
+  for (const c of candidates) {
+    if (await trySpawnDetached(c.cmd, [...c.extraArgs, "scripts/macro_analytics.py", "refresh"], process.cwd())) {
+      return true;
+    }
+  }
+  return false;
+}
 
 export async function GET() {
   // Placeholder: server action would populate caches. For now, noop and revalidate.
@@ -8,9 +49,8 @@ export async function GET() {
 }
 
 export async function POST() {
-  // Placeholder: server action would populate caches. For now, noop and revalidate.
+  // Kick off the macro ingest/precompute in the background and revalidate
+  const macroRefresh = await startMacroRefresh();
   revalidatePath("/");
-  return NextResponse.json({ ok: true, updatedAt: Date.now() });
+  return NextResponse.json({ ok: true, macroRefresh, updatedAt: Date.now() });
 }
-
-
@@ -1,4 +1,5 @@
 import { NextResponse } from "next/server";
+import { readMacroPulse } from "@/lib/cache";
 
 const CSV_URL = "https://policyuncertainty.com/media/All_Daily_TPU_Data.csv";
 const CACHE_HOURS = 24;
@@ -38,6 +39,21 @@ export async function GET() {
       return NextResponse.json(cache.data);
     }
 
+    // Precomputed by scripts/macro_analytics.py (same EMA7 / 7d-avg delta / z as below);
+    // skips downloading and splitting the CSV
+    const rec = readMacroPulse("tpu");
+    if (rec && rec.value !== null) {
+      const result = {
+        key: "trade",
+        label: rec.z === null ? ("Medium" as const) : getLabel(rec.z),
+        deltaPct: Math.round(rec.deltaPct),
+        value: Math.round(rec.value),
+        asOf: rec.asOf.slice(0, 7)
+      };
+      cache = { data: result, timestamp: Date.now() };
+      return NextResponse.json(result);
+    }
+
     // Fetch CSV (no Next.js cache due to large file size)
     const response = await fetch(CSV_URL, { 
       headers: { "User-Agent": "Market-Dashboard/1.0" }
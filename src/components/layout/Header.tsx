@@ -34,7 +34,7 @@ export function Header() {
               onClick={() =>
                 startTransition(async () => {
                   try {
-                    const res = await fetch("/api/refresh", { method: "GET", cache: "no-store" });
+                    const res = await fetch("/api/refresh", { method: "POST", cache: "no-store" });
                     if (!res.ok) console.error("/api/refresh", res.status, await res.text());
                   } catch (e) {
                     console.error(e);
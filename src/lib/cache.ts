@@ -62,3 +62,31 @@ export const devFileCache = {
 };
 
 
+
+// Precomputed macro-series records written by scripts/macro_analytics.py (tmp/macro_summary.json).
+// `pulse` holds each route's own headline metric; `checkedAt` moves on every refresh that
+// confirmed the data is current (including 304s), so it is what staleness is judged by.
+export type MacroPulse = { value: number | null; deltaPct: number; z: number | null; asOf: string };
+
+export type MacroRecord = {
+  key: string;
+  label: string;
+  asOf: string;
+  value: number | null;
+  z: number | null;
+  pctRank: number | null;
+  delta1d: number | null;
+  delta1w: number | null;
+  delta1m: number | null;
+  points: number;
+  pulse: MacroPulse | null;
+  checkedAt: number;
+};
+
+export function readMacroPulse(key: string, maxAgeMs = 48 * 3600 * 1000): MacroPulse | null {
+  const summary = devFileCache.read<{ series: Record<string, MacroRecord> }>("macro_summary.json");
+  const rec = summary?.series?.[key];
+  if (!rec?.checkedAt || Date.now() - rec.checkedAt > maxAgeMs) return null;
+  if (!rec.pulse || rec.pulse.value === null) return null;
+  return rec.pulse;
+}